@@ -0,0 +1,203 @@
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from corpus import SHAPES, default_pages, generate_corpus
+from gencontent import collect_pages, generate_pages_recursive
+from inline_markdown import memo_parse, text_to_textnodes
+from markdown_blocks import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html_node,
+)
+
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the build pipeline on synthetic content trees."
+    )
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=SHAPES,
+        help="corpus shape to run (repeatable, default: all)",
+    )
+    parser.add_argument("--pages", type=int, help="pages per corpus")
+    parser.add_argument("--scale", type=int, default=1, help="page size multiplier")
+    parser.add_argument("--repeat", type=int, default=3, help="keep the best of N runs")
+    parser.add_argument("--jobs", type=int, default=1, help="jobs for the full build")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    return parser.parse_args()
+
+
+def best_time(func, repeat, setup=None):
+    # setup runs untimed before every run, so each one starts from scratch
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def load_sources(content_dir):
+    sources = []
+    for from_path, _ in collect_pages(content_dir, ""):
+        with open(from_path, "r") as f:
+            sources.append(f.read())
+    return sources
+
+
+def inline_inputs(sources):
+    texts = []
+    for markdown in sources:
+        for block in markdown_to_blocks(markdown):
+            if block_to_block_type(block) == BlockType.PARAGRAPH:
+                texts.append(" ".join(block.split("\n")))
+    return texts
+
+
+def bench_corpus(shape, pages, scale, repeat, jobs):
+    with tempfile.TemporaryDirectory() as root:
+        content_dir = os.path.join(root, "content")
+        public_dir = os.path.join(root, "public")
+        template_path = os.path.join(root, "template.html")
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+        total_bytes = generate_corpus(content_dir, shape, pages, scale)
+
+        sources = load_sources(content_dir)
+        texts = inline_inputs(sources)
+        nodes = [markdown_to_html_node(markdown) for markdown in sources]
+
+        def cold_memo():
+            # the inline memo is process-wide and would otherwise stay warm
+            # from earlier stages and runs (and pool workers fork from here)
+            memo_parse.cache_clear()
+
+        def empty_output():
+            # a second build into the same directory would skip every write
+            cold_memo()
+            shutil.rmtree(public_dir, ignore_errors=True)
+
+        def build():
+            with redirect_stdout(io.StringIO()):
+                generate_pages_recursive(
+                    content_dir, template_path, public_dir, "/", jobs
+                )
+
+        stages = {
+            "read": lambda: load_sources(content_dir),
+            "markdown_to_blocks": lambda: [markdown_to_blocks(md) for md in sources],
+            "text_to_textnodes": lambda: [text_to_textnodes(text) for text in texts],
+            "markdown_to_html_node": lambda: [
+                markdown_to_html_node(md) for md in sources
+            ],
+            "to_html": lambda: [node.to_html() for node in nodes],
+            "generate_pages_recursive": build,
+        }
+        results = {}
+        for name, func in stages.items():
+            setup = empty_output if name == "generate_pages_recursive" else cold_memo
+            seconds = best_time(func, repeat, setup)
+            results[name] = {
+                "seconds": seconds,
+                "pages_per_sec": pages / seconds if seconds else None,
+                "mb_per_sec": total_bytes / 1e6 / seconds if seconds else None,
+            }
+        return {
+            "shape": shape,
+            "pages": pages,
+            "scale": scale,
+            "bytes": total_bytes,
+            "stages": results,
+        }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def print_results(runs, previous=None):
+    previous_stages = {}
+    if previous is not None:
+        for run in previous["runs"]:
+            previous_stages[run["shape"]] = run["stages"]
+    for run in runs:
+        print(f"{run['shape']}: {run['pages']} pages, {run['bytes'] / 1e6:.2f} MB")
+        for name, stage in run["stages"].items():
+            line = (
+                f"  {name:<26}{stage['seconds'] * 1000:>10.1f} ms"
+                f"{stage['pages_per_sec']:>12.1f} pages/s"
+                f"{stage['mb_per_sec']:>10.2f} MB/s"
+            )
+            old_stage = previous_stages.get(run["shape"], {}).get(name)
+            if old_stage is not None:
+                line += f"{old_stage['seconds'] / stage['seconds']:>8.2f}x"
+            print(line)
+
+
+def main():
+    args = parse_args()
+    shapes = args.shape or list(SHAPES)
+    runs = []
+    for shape in shapes:
+        pages = args.pages or default_pages(shape)
+        runs.append(bench_corpus(shape, pages, args.scale, args.repeat, args.jobs))
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            previous = json.load(f)
+    print_results(runs, previous)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": runs,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import sys
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+
+# dict-backed stand-ins with the same fields as the node classes, used as the
+# baseline for the per-node comparison
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictLeafNode:
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
+def measure(factory, count):
+    # the strings are shared, so only the node objects themselves are counted
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    nodes = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    total = sum(stat.size_diff for stat in stats)
+    list_size = sys.getsizeof(nodes)
+    del nodes
+    return (total - list_size) / count
+
+
+def main():
+    count = 100_000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    text = "some inline text"
+    cases = [
+        (
+            "TextNode",
+            lambda i: DictTextNode(text, TextType.TEXT),
+            lambda i: TextNode(text, TextType.TEXT),
+        ),
+        (
+            "LeafNode",
+            lambda i: DictLeafNode("b", text),
+            lambda i: LeafNode("b", text),
+        ),
+    ]
+    print(f"{'node':<12}{'__dict__':>12}{'__slots__':>12}{'saved':>12}")
+    for name, dict_factory, slots_factory in cases:
+        dict_size = measure(dict_factory, count)
+        slots_size = measure(slots_factory, count)
+        saved = dict_size - slots_size
+        print(f"{name:<12}{dict_size:>10.1f} B{slots_size:>10.1f} B{saved:>10.1f} B")
+
+    tree_size = measure(lambda i: ParentNode("li", [LeafNode(None, text)]), count)
+    print(f"{'li subtree':<12}{'':>12}{tree_size:>10.1f} B")
+
+
+if __name__ == "__main__":
+    main()
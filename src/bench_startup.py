@@ -0,0 +1,115 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+MAIN = os.path.join(SRC_DIR, "main.py")
+
+# what main.py imported up front before the CLI was split into commands
+EAGER_IMPORTS = (
+    "import argparse, buildplan, compress, copystatic, gencontent, manifest, "
+    "output, rendercache, shard"
+)
+
+PAGE = "# Startup\n\nA *small* page with a [link](/) and `code`.\n"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark CLI start-up time for each command."
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="runs per command")
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="also list the slowest imports of render-one (python -X importtime)",
+    )
+    return parser.parse_args()
+
+
+def commands(page_path):
+    python = sys.executable
+    return (
+        ("python (no imports)", [python, "-c", "pass"]),
+        ("eager imports", [python, "-c", EAGER_IMPORTS]),
+        ("render-one", [python, MAIN, "render-one", page_path]),
+        ("check", [python, MAIN, "check"]),
+        ("build --help", [python, MAIN, "build", "--help"]),
+    )
+
+
+def median_time(command, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(
+            command,
+            cwd=ROOT_DIR,
+            env=command_env(),
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def command_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC_DIR
+    return env
+
+
+def slowest_imports(command, top=10):
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        cwd=ROOT_DIR,
+        env=command_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            imports.append((int(cumulative), name.strip()))
+    return len(result.stderr.splitlines()) - 1, sorted(imports, reverse=True)[:top]
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        page_path = os.path.join(tmp, "page.md")
+        with open(page_path, "w") as f:
+            f.write(PAGE)
+
+        print(f"Median of {args.repeat} runs:")
+        baseline = None
+        for name, command in commands(page_path):
+            elapsed = median_time(command, args.repeat)
+            if baseline is None:
+                baseline = elapsed
+            print(
+                f"  {name:<22}{elapsed * 1000:>8.1f} ms"
+                f"{(elapsed - baseline) * 1000:>+10.1f} ms over bare python"
+            )
+
+        if args.importtime:
+            render_one = dict(commands(page_path))["render-one"]
+            count, imports = slowest_imports(render_one)
+            print(f"render-one imports {count} modules, slowest top-level imports:")
+            for cumulative, name in imports:
+                print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+from pathlib import PurePosixPath
+
+from buildplan import scan_tree
+from gencontent import read_markdown
+from render import render_markdown
+from template import Template
+
+
+class Builder:
+    # renders pages entirely in memory: no content/ walk, no static copy and
+    # nothing written to docs/
+    def __init__(self, template, basepath="/", minify=False, cache=None):
+        if not isinstance(template, Template):
+            template = Template(template, basepath, minify)
+        self.template = template
+        self.cache = cache
+
+    def render(self, markdown):
+        return render_markdown(markdown, self.template, self.cache)
+
+    def render_bytes(self, markdown):
+        return self.render(markdown).encode("utf-8")
+
+    def build(self, pages):
+        rendered = {}
+        for content_path, markdown in pages.items():
+            try:
+                rendered[output_path(content_path)] = self.render(markdown)
+            except ValueError as e:
+                raise ValueError(f"{content_path}: {e}")
+        return rendered
+
+    def __repr__(self):
+        return f"Builder({self.template.basepath}, minify: {self.template.minify})"
+
+
+def output_path(content_path):
+    return str(PurePosixPath(content_path).with_suffix(".html"))
+
+
+def read_pages(dir_path_content):
+    pages = {}
+    for entry in scan_tree(dir_path_content, ""):
+        content_path = os.path.relpath(entry.source, dir_path_content)
+        pages[content_path.replace(os.sep, "/")] = read_markdown(entry.source)
+    return pages
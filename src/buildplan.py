@@ -0,0 +1,86 @@
+import json
+import os
+from pathlib import Path
+
+
+class PlanEntry:
+    __slots__ = ("source", "dest", "size", "mtime_ns")
+
+    def __init__(self, source, dest, size, mtime_ns):
+        self.source = source
+        self.dest = dest
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def __eq__(self, other):
+        return (
+            self.source == other.source
+            and str(self.dest) == str(other.dest)
+            and self.size == other.size
+            and self.mtime_ns == other.mtime_ns
+        )
+
+    def __repr__(self):
+        return f"PlanEntry({self.source}, {self.dest}, {self.size}, {self.mtime_ns})"
+
+
+class BuildPlan:
+    def __init__(self, pages, assets):
+        self.pages = pages
+        self.assets = assets
+
+    def page_pairs(self):
+        return [(entry.source, entry.dest) for entry in self.pages]
+
+    def to_dict(self):
+        return {
+            "pages": [entry_to_dict(entry) for entry in self.pages],
+            "assets": [entry_to_dict(entry) for entry in self.assets],
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def __repr__(self):
+        return f"BuildPlan(pages: {len(self.pages)}, assets: {len(self.assets)})"
+
+
+def entry_to_dict(entry):
+    return {
+        "source": entry.source,
+        "dest": str(entry.dest),
+        "size": entry.size,
+        "mtime_ns": entry.mtime_ns,
+    }
+
+
+def scan_tree(source_dir_path, dest_dir_path, page_suffix=None):
+    return list(iter_tree(source_dir_path, dest_dir_path, page_suffix))
+
+
+def iter_tree(source_dir_path, dest_dir_path, page_suffix=None):
+    # iterative depth-first walk in sorted order; DirEntry caches the file type
+    # from the directory listing and the stat result after its first call.
+    # Only the unvisited siblings along the current path are held in memory
+    if not os.path.isdir(source_dir_path):
+        return
+    stack = [(None, source_dir_path, dest_dir_path)]
+    while stack:
+        dir_entry, path, dest_path = stack.pop()
+        if dir_entry is not None and not dir_entry.is_dir():
+            stat = dir_entry.stat()
+            if page_suffix is not None:
+                dest_path = Path(dest_path).with_suffix(page_suffix)
+            yield PlanEntry(path, dest_path, stat.st_size, stat.st_mtime_ns)
+            continue
+        with os.scandir(path) as it:
+            children = sorted(it, key=lambda child: child.name)
+        for child in reversed(children):
+            stack.append((child, child.path, os.path.join(dest_path, child.name)))
+
+
+def make_plan(dir_path_content, dir_path_static, dest_dir_path):
+    pages = scan_tree(dir_path_content, dest_dir_path, ".html")
+    assets = scan_tree(dir_path_static, dest_dir_path)
+    return BuildPlan(pages, assets)
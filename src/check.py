@@ -0,0 +1,37 @@
+import os
+
+from buildplan import make_plan
+from depgraph import find_references, output_urls
+from markdown_blocks import markdown_to_html_node
+from render import extract_title
+from template import load_template
+
+
+def check_site(dir_path_content, dir_path_static, template_path):
+    # renders every page in memory and reports problems instead of writing;
+    # outputs are planned under "/" so their paths double as site URLs
+    problems = []
+    template = load_template(template_path)
+    slot_names = {name for _, name in template.slots}
+    for name in ("Title", "Content"):
+        if name not in slot_names:
+            problems.append((template_path, f"no {{{{ {name} }}}} placeholder"))
+
+    plan = make_plan(dir_path_content, dir_path_static, os.sep)
+    urls = set()
+    for entry in plan.pages + plan.assets:
+        urls.update(output_urls(entry.dest, os.sep))
+
+    for entry in plan.pages:
+        with open(entry.source, "r") as f:
+            markdown = f.read()
+        try:
+            extract_title(markdown)
+            html = markdown_to_html_node(markdown).to_html()
+        except ValueError as e:
+            problems.append((entry.source, str(e)))
+            continue
+        for reference in sorted(set(find_references(html))):
+            if reference not in urls:
+                problems.append((entry.source, f"broken link: {reference}"))
+    return problems, len(plan.pages)
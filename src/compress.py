@@ -0,0 +1,98 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from output import temp_path_for
+from pipeline import bounded_map
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_SUFFIXES = (".html", ".css")
+SIBLING_SUFFIXES = (".gz", ".br")
+
+
+def available_formats():
+    if brotli is None:
+        return ("gz",)
+    return ("gz", "br")
+
+
+def compress_data(data, compress_format):
+    if compress_format == "gz":
+        # a fixed mtime keeps the output byte-for-byte reproducible
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if compress_format == "br":
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"invalid compression format: {compress_format}")
+
+
+def compress_file(path, formats=("gz",)):
+    # a sibling is up to date when it carries the source's mtime, which is
+    # only stamped on after it has been fully written
+    stat = os.stat(path)
+    siblings = []
+    written = []
+    data = None
+    for compress_format in formats:
+        sibling_path = f"{path}.{compress_format}"
+        siblings.append(sibling_path)
+        try:
+            if os.stat(sibling_path).st_mtime_ns == stat.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        tmp_path = temp_path_for(sibling_path)
+        with open(tmp_path, "wb") as f:
+            f.write(compress_data(data, compress_format))
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, sibling_path)
+        written.append(sibling_path)
+    return siblings, written
+
+
+def remove_stale_siblings(paths):
+    # an output rewritten by a build without compression keeps its old
+    # siblings, which a server would still send; they no longer carry the
+    # output's mtime
+    removed = []
+    for path in sorted(paths):
+        if not path.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+        mtime_ns = None
+        for suffix in SIBLING_SUFFIXES:
+            sibling_path = f"{path}{suffix}"
+            try:
+                sibling_mtime_ns = os.stat(sibling_path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if mtime_ns is None:
+                mtime_ns = os.stat(path).st_mtime_ns
+            if sibling_mtime_ns != mtime_ns:
+                os.remove(sibling_path)
+                removed.append(sibling_path)
+    return removed
+
+
+def compress_outputs(paths, jobs=None, formats=None, stats=None):
+    if formats is None:
+        formats = available_formats()
+    paths = sorted(path for path in paths if path.endswith(COMPRESSIBLE_SUFFIXES))
+    jobs = jobs or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # zlib and brotli release the GIL while compressing
+        results = bounded_map(
+            executor, lambda path: compress_file(path, formats), paths, jobs * 4
+        )
+        for _, (siblings, written) in results:
+            for sibling_path in siblings:
+                if sibling_path in written:
+                    print(f" * {sibling_path}")
+                if stats is not None:
+                    stats.record(sibling_path, sibling_path in written)
@@ -1,8 +1,19 @@
 import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
+from buildplan import scan_tree
+from manifest import entry_hash, remove_output
+from output import copy_if_changed, make_parent_dirs, temp_path_for
+from pipeline import bounded_map
 
-def copy_files_recursive(source_dir_path, dest_dir_path):
+
+LINK_MODES = ("copy", "hardlink", "reflink", "sendfile")
+FICLONE = 0x40049409
+
+
+def copy_files_recursive(source_dir_path, dest_dir_path, stats=None):
     if not os.path.exists(dest_dir_path):
         os.mkdir(dest_dir_path)
 
@@ -11,6 +22,143 @@ def copy_files_recursive(source_dir_path, dest_dir_path):
         dest_path = os.path.join(dest_dir_path, filename)
         print(f" * {from_path} -> {dest_path}")
         if os.path.isfile(from_path):
-            shutil.copy(from_path, dest_path)
+            written = copy_if_changed(from_path, dest_path)
+            if stats is not None:
+                stats.record(dest_path, written)
         else:
-            copy_files_recursive(from_path, dest_path)
+            copy_files_recursive(from_path, dest_path, stats)
+
+
+def copy_files_incremental(
+    source_dir_path,
+    dest_dir_path,
+    manifest,
+    stats=None,
+    planned=None,
+    jobs=8,
+    link_mode="copy",
+):
+    if planned is None:
+        planned = scan_tree(source_dir_path, dest_dir_path)
+    old_files = manifest["static"]
+    files = {}
+    changed = []
+    changed_entries = []
+    for entry in planned:
+        from_path, dest_path = entry.source, entry.dest
+        old_file = old_files.get(from_path)
+        file_hash = entry_hash(entry, old_file)
+        files[from_path] = {
+            "hash": file_hash,
+            "dest": dest_path,
+            "size": entry.size,
+            "mtime_ns": entry.mtime_ns,
+        }
+        if (
+            old_file is None
+            or old_file["hash"] != file_hash
+            or not os.path.exists(dest_path)
+        ):
+            changed.append(dest_path)
+            changed_entries.append(entry)
+        elif stats is not None:
+            stats.record(dest_path, False)
+    # changed assets go through the same thread pool and link mode as a full
+    # build
+    copy_assets(changed_entries, jobs, link_mode, stats)
+
+    dest_paths = {file["dest"] for file in files.values()}
+    for old_file in old_files.values():
+        if old_file["dest"] not in dest_paths:
+            print(f" - {old_file['dest']}")
+            changed.append(old_file["dest"])
+            remove_output(old_file["dest"], dest_dir_path)
+
+    manifest["static"] = files
+    return changed
+
+
+def copy_files_parallel(
+    source_dir_path, dest_dir_path, jobs=8, link_mode="copy", stats=None
+):
+    copy_assets(scan_tree(source_dir_path, dest_dir_path), jobs, link_mode, stats)
+
+
+def copy_assets(planned, jobs=8, link_mode="copy", stats=None):
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"invalid link mode: {link_mode}")
+    jobs = max(1, jobs)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = bounded_map(
+            executor,
+            lambda entry: sync_file(
+                entry.source, entry.dest, link_mode, (entry.size, entry.mtime_ns)
+            ),
+            planned,
+            jobs * 4,
+        )
+        for entry, written in results:
+            if written:
+                print(f" * {entry.source} -> {entry.dest}")
+            if stats is not None:
+                stats.record(entry.dest, written)
+
+
+def sync_file(from_path, dest_path, link_mode="copy", source_stat=None):
+    # hard links share size and mtime with their source, so they are skipped
+    # by the same check as copies
+    if source_stat is None:
+        stat = os.stat(from_path)
+        source_stat = (stat.st_size, stat.st_mtime_ns)
+    try:
+        stat = os.stat(dest_path)
+        if (stat.st_size, stat.st_mtime_ns) == tuple(source_stat):
+            return False
+    except FileNotFoundError:
+        pass
+
+    make_parent_dirs(dest_path)
+    tmp_path = temp_path_for(dest_path)
+    try:
+        place_file(from_path, tmp_path, link_mode)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+def place_file(from_path, dest_path, link_mode):
+    # every mode falls back to a plain copy when the filesystem can't do it;
+    # the source mtime is kept so the next build can skip the file by stat
+    if link_mode == "hardlink":
+        try:
+            os.link(from_path, dest_path)
+            return
+        except OSError:
+            pass
+    elif link_mode == "reflink" and sys.platform == "linux":
+        import fcntl
+
+        with open(from_path, "rb") as source, open(dest_path, "wb") as dest:
+            try:
+                fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+                cloned = True
+            except OSError:
+                cloned = False
+        if cloned:
+            shutil.copystat(from_path, dest_path)
+            return
+    elif link_mode == "sendfile" and hasattr(os, "sendfile"):
+        with open(from_path, "rb") as source, open(dest_path, "wb") as dest:
+            size = os.fstat(source.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dest.fileno(), source.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        shutil.copystat(from_path, dest_path)
+        return
+    shutil.copy2(from_path, dest_path)
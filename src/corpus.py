@@ -0,0 +1,117 @@
+import os
+import random
+
+
+SHAPES = ("many-small", "few-huge", "link-dense", "long-lists", "deep-dirs")
+
+WORDS = (
+    "the ring was forged in the fires of mount doom and carried by a hobbit "
+    "across the misty mountains through moria and lothlorien to the river anduin "
+    "while the fellowship scattered and gondor prepared for war"
+).split()
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def inline_text(rng, words=12, links=0):
+    parts = []
+    for i in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.05:
+            word = f"**{word}**"
+        elif roll < 0.1:
+            word = f"_{word}_"
+        elif roll < 0.13:
+            word = f"`{word}`"
+        parts.append(word)
+    for i in range(links):
+        position = rng.randrange(len(parts) + 1)
+        if rng.random() < 0.2:
+            parts.insert(position, f"![{rng.choice(WORDS)}](/images/{i}.png)")
+        else:
+            parts.insert(position, f"[{rng.choice(WORDS)}](/blog/{rng.choice(WORDS)})")
+    return " ".join(parts)
+
+
+def paragraph(rng, lines=3, links=0):
+    return "\n".join(inline_text(rng, links=links) for _ in range(lines))
+
+
+def unordered_list(rng, items):
+    return "\n".join(f"- {inline_text(rng, 6)}" for _ in range(items))
+
+
+def ordered_list(rng, items):
+    return "\n".join(f"{i}. {inline_text(rng, 6)}" for i in range(1, items + 1))
+
+
+def code_block(rng, lines):
+    body = "\n".join(f"    {sentence(rng, 6)}" for _ in range(lines))
+    return f"```\n{body}\n```"
+
+
+def quote(rng, lines):
+    return "\n".join(f"> {sentence(rng)}" for _ in range(lines))
+
+
+def page(rng, sections, links=0, list_items=5):
+    blocks = [f"# {sentence(rng, 5)}"]
+    for i in range(sections):
+        blocks.append(f"## {sentence(rng, 4)}")
+        blocks.append(paragraph(rng, links=links))
+        kind = i % 4
+        if kind == 0:
+            blocks.append(unordered_list(rng, list_items))
+        elif kind == 1:
+            blocks.append(ordered_list(rng, list_items))
+        elif kind == 2:
+            blocks.append(code_block(rng, 4))
+        else:
+            blocks.append(quote(rng, 2))
+    return "\n\n".join(blocks) + "\n"
+
+
+def page_markdown(rng, shape, scale):
+    if shape == "many-small":
+        return page(rng, sections=2 * scale)
+    if shape == "few-huge":
+        return page(rng, sections=400 * scale)
+    if shape == "link-dense":
+        return page(rng, sections=4 * scale, links=20)
+    if shape == "long-lists":
+        return page(rng, sections=2 * scale, list_items=500)
+    if shape == "deep-dirs":
+        return page(rng, sections=scale)
+    raise ValueError(f"invalid corpus shape: {shape}")
+
+
+def page_dir(root, shape, index):
+    if shape == "deep-dirs":
+        # every page sits one level below the previous one
+        parts = [f"d{i}" for i in range(index)]
+        return os.path.join(root, *parts)
+    return os.path.join(root, f"section{index % 10}", f"page{index}")
+
+
+def generate_corpus(root, shape, pages, scale=1, seed=0):
+    rng = random.Random(seed)
+    total_bytes = 0
+    for index in range(pages):
+        dir_path = page_dir(root, shape, index)
+        os.makedirs(dir_path, exist_ok=True)
+        markdown = page_markdown(rng, shape, scale)
+        with open(os.path.join(dir_path, "index.md"), "w") as f:
+            f.write(markdown)
+        total_bytes += len(markdown.encode("utf-8"))
+    return total_bytes
+
+
+def default_pages(shape):
+    if shape == "few-huge":
+        return 5
+    if shape in ("deep-dirs", "long-lists"):
+        return 100
+    return 500
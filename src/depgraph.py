@@ -0,0 +1,91 @@
+import os
+import re
+
+
+REFERENCE_PATTERN = re.compile(r'(?:src|href)="(/[^"]*)"')
+
+
+def find_references(html):
+    references = []
+    for reference in REFERENCE_PATTERN.findall(html):
+        if reference.startswith("//"):
+            continue
+        reference = reference.split("#", 1)[0].split("?", 1)[0]
+        references.append(reference)
+    return references
+
+
+def collecting_writer(write, references):
+    def collect(html):
+        references.extend(find_references(html))
+        write(html)
+
+    return collect
+
+
+def output_urls(dest_path, dest_dir_path):
+    relative = os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/")
+    url = f"/{relative}"
+    urls = [url]
+    if url.endswith("/index.html"):
+        directory = url[: -len("index.html")]
+        urls.append(directory)
+        if directory != "/":
+            urls.append(directory.rstrip("/"))
+    return urls
+
+
+def url_index(entries, dest_dir_path):
+    index = {}
+    for from_path, entry in entries.items():
+        for url in output_urls(entry["dest"], dest_dir_path):
+            index[url] = from_path
+    return index
+
+
+def rebuild_reasons(
+    old_pages,
+    pages,
+    dest_dir_path,
+    template_changed=False,
+    basepath_changed=False,
+    changed_assets=(),
+    minify_changed=False,
+):
+    changed_asset_urls = set()
+    for dest_path in changed_assets:
+        changed_asset_urls.update(output_urls(dest_path, dest_dir_path))
+    old_page_urls = url_index(old_pages, dest_dir_path)
+    page_urls = url_index(pages, dest_dir_path)
+    added_page_urls = page_urls.keys() - old_page_urls.keys()
+    removed_page_urls = old_page_urls.keys() - page_urls.keys()
+
+    reasons = {}
+    for from_path, page in pages.items():
+        page_reasons = []
+        old_page = old_pages.get(from_path)
+        if old_page is None:
+            page_reasons.append("new page")
+        else:
+            if old_page["hash"] != page["hash"]:
+                page_reasons.append("source changed")
+            if old_page["dest"] != page["dest"]:
+                page_reasons.append("output path changed")
+            elif not os.path.exists(page["dest"]):
+                page_reasons.append("output missing")
+            if template_changed:
+                page_reasons.append(f"template changed: {page['template']}")
+            if basepath_changed:
+                page_reasons.append("base path changed")
+            if minify_changed:
+                page_reasons.append("minify mode changed")
+            for reference in old_page.get("refs", ()):
+                if reference in changed_asset_urls:
+                    page_reasons.append(f"asset changed: {reference}")
+                elif reference in added_page_urls:
+                    page_reasons.append(f"linked page added: {reference}")
+                elif reference in removed_page_urls:
+                    page_reasons.append(f"linked page removed: {reference}")
+        if page_reasons:
+            reasons[from_path] = page_reasons
+    return reasons
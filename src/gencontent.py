@@ -1,48 +1,257 @@
 import os
-from pathlib import Path
-from markdown_blocks import markdown_to_html_node
 
+from buildplan import scan_tree
+from depgraph import rebuild_reasons
+from manifest import entry_hash, hash_file, remove_output
+from output import (
+    make_parent_dirs,
+    replace_if_changed,
+    temp_path_for,
+    write_if_changed,
+)
+from pipeline import bounded_map
+from render import extract_title, render_markdown, stream_markdown
+from template import load_template
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
-    for filename in os.listdir(dir_path_content):
-        from_path = os.path.join(dir_path_content, filename)
-        dest_path = os.path.join(dest_dir_path, filename)
-        if os.path.isfile(from_path):
-            dest_path = Path(dest_path).with_suffix(".html")
-            generate_page(from_path, template_path, dest_path, basepath)
+
+def generate_pages_recursive(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath,
+    jobs=1,
+    stream=False,
+    stats=None,
+    cache=None,
+    minify=False,
+):
+    pages = collect_pages(dir_path_content, dest_dir_path)
+    generate_pages(
+        pages, template_path, basepath, jobs, stream, stats, cache, minify=minify
+    )
+
+
+def generate_pages(
+    pages,
+    template_path,
+    basepath,
+    jobs=1,
+    stream=False,
+    stats=None,
+    cache=None,
+    references=None,
+    minify=False,
+    window=None,
+):
+    # with a window, pages may be a lazy iterable and at most window pages
+    # are queued or rendering at any time
+    template = load_template(template_path, basepath, minify)
+    if jobs <= 1 or window is None and len(pages) <= 1:
+        for from_path, dest_path in pages:
+            print(f" * {from_path} {template_path} -> {dest_path}")
+            page_references = [] if references is not None else None
+            written = render_page(
+                from_path, template, dest_path, stream, cache, page_references
+            )
+            if stats is not None:
+                stats.record(dest_path, written)
+            if references is not None:
+                references[from_path] = sorted(set(page_references))
+        return
+
+    # multiprocessing is only imported by builds that use it
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_config = None
+    if cache is not None:
+        # workers share the cache file, each through its own connection
+        cache.flush()
+        cache_config = (cache.path, cache.max_entries)
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(template, stream, cache_config, references is not None),
+    ) as executor:
+        if window is None:
+            from_paths = [from_path for from_path, _ in pages]
+            dest_paths = [dest_path for _, dest_path in pages]
+            chunksize = max(1, len(pages) // (jobs * 4))
+            results = zip(
+                pages,
+                executor.map(
+                    render_worker_page, from_paths, dest_paths, chunksize=chunksize
+                ),
+            )
+        else:
+            results = bounded_map(executor, render_worker_pair, pages, window)
+        # both yield in submission order, so progress lines match a serial build
+        for (from_path, dest_path), result in results:
+            print(f" * {from_path} {template_path} -> {dest_path}")
+            written, page_references = result
+            if stats is not None:
+                stats.record(dest_path, written)
+            if references is not None:
+                references[from_path] = sorted(set(page_references))
+
+
+worker_template = None
+worker_stream = False
+worker_cache = None
+worker_collect_references = False
+
+
+def init_worker(template, stream, cache_config, collect_references):
+    global worker_template, worker_stream, worker_cache, worker_collect_references
+    worker_template = template
+    worker_stream = stream
+    if cache_config is not None:
+        from rendercache import RenderCache
+
+        worker_cache = RenderCache(*cache_config)
+    worker_collect_references = collect_references
+
+
+def render_worker_page(from_path, dest_path):
+    page_references = [] if worker_collect_references else None
+    written = render_page(
+        from_path,
+        worker_template,
+        dest_path,
+        worker_stream,
+        worker_cache,
+        page_references,
+    )
+    if worker_cache is not None:
+        # pool workers exit without cleanup, so persist fragments per page
+        worker_cache.flush()
+    return written, page_references
+
+
+def render_worker_pair(page):
+    return render_worker_page(*page)
+
+
+def collect_pages(dir_path_content, dest_dir_path):
+    return [
+        (entry.source, entry.dest)
+        for entry in scan_tree(dir_path_content, dest_dir_path, ".html")
+    ]
+
+
+def generate_pages_incremental(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath,
+    manifest,
+    jobs=1,
+    stream=False,
+    stats=None,
+    cache=None,
+    changed_assets=(),
+    explain=False,
+    planned=None,
+    minify=False,
+):
+    if planned is None:
+        planned = scan_tree(dir_path_content, dest_dir_path, ".html")
+    template_hash = hash_file(template_path)
+    old_pages = manifest["pages"]
+    pages = {}
+    dest_paths_by_source = {}
+    for entry in planned:
+        from_path, dest_path = entry.source, entry.dest
+        pages[from_path] = {
+            "hash": entry_hash(entry, old_pages.get(from_path)),
+            "dest": str(dest_path),
+            "template": template_path,
+            "size": entry.size,
+            "mtime_ns": entry.mtime_ns,
+        }
+        dest_paths_by_source[from_path] = dest_path
+    reasons = rebuild_reasons(
+        old_pages,
+        pages,
+        dest_dir_path,
+        template_changed=manifest["template"] != template_hash,
+        basepath_changed=manifest["basepath"] != basepath,
+        minify_changed=manifest.get("minify", False) != minify,
+        changed_assets=changed_assets,
+    )
+
+    changed_pages = []
+    for from_path, dest_path in dest_paths_by_source.items():
+        if from_path in reasons:
+            changed_pages.append((from_path, dest_path))
+            if explain:
+                print(f" ? {from_path}: {'; '.join(reasons[from_path])}")
         else:
-            generate_pages_recursive(from_path, template_path, dest_path, basepath)
+            pages[from_path]["refs"] = old_pages[from_path].get("refs", [])
+            if stats is not None:
+                stats.record(dest_path, False)
+    references = {}
+    generate_pages(
+        changed_pages,
+        template_path,
+        basepath,
+        jobs,
+        stream,
+        stats,
+        cache,
+        references,
+        minify,
+    )
+    for from_path, page_references in references.items():
+        pages[from_path]["refs"] = page_references
+
+    dest_paths = {page["dest"] for page in pages.values()}
+    for old_page in old_pages.values():
+        if old_page["dest"] not in dest_paths:
+            print(f" - {old_page['dest']}")
+            remove_output(old_page["dest"], dest_dir_path)
+
+    manifest["template"] = template_hash
+    manifest["basepath"] = basepath
+    manifest["minify"] = minify
+    manifest["pages"] = pages
+    skipped = len(pages) - len(changed_pages)
+    print(f"{len(changed_pages)} pages generated, {skipped} unchanged")
 
 
 def generate_page(from_path, template_path, dest_path, basepath):
     print(f" * {from_path} {template_path} -> {dest_path}")
-    from_file = open(from_path, "r")
-    markdown_content = from_file.read()
-    from_file.close()
-
-    template_file = open(template_path, "r")
-    template = template_file.read()
-    template_file.close()
-
-    node = markdown_to_html_node(markdown_content)
-    html = node.to_html()
-
-    title = extract_title(markdown_content)
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html)
-    template = template.replace('href="/', f'href="{basepath}')
-    template = template.replace('src="/', f'src="{basepath}')
-
-    dest_dir_path = os.path.dirname(dest_path)
-    if dest_dir_path != "":
-        os.makedirs(dest_dir_path, exist_ok=True)
-    to_file = open(dest_path, "w")
-    to_file.write(template)
-
-
-def extract_title(md):
-    lines = md.split("\n")
-    for line in lines:
-        if line.startswith("# "):
-            return line[2:]
-    raise ValueError("no title found")
+    render_page(from_path, load_template(template_path, basepath), dest_path)
+
+
+def render_page(
+    from_path, template, dest_path, stream=False, cache=None, references=None
+):
+    if stream:
+        return render_page_streaming(
+            from_path, template, dest_path, cache, references
+        )
+    markdown_content = read_markdown(from_path)
+    page = render_markdown(markdown_content, template, cache, references)
+    return write_if_changed(dest_path, page)
+
+
+def read_markdown(from_path):
+    with open(from_path, "r") as from_file:
+        return from_file.read()
+
+
+def render_page_streaming(
+    from_path, template, dest_path, cache=None, references=None
+):
+    # only the lines up to the title and one block at a time are held in memory
+    make_parent_dirs(dest_path)
+    tmp_path = temp_path_for(dest_path)
+    try:
+        with open(from_path, "r") as from_file:
+            with open(tmp_path, "w", encoding="utf-8") as to_file:
+                stream_markdown(from_file, template, to_file.write, cache, references)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return replace_if_changed(tmp_path, dest_path)
@@ -1,4 +1,6 @@
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -21,6 +23,8 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
@@ -36,18 +40,39 @@ class LeafNode(HTMLNode):
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
     def to_html(self):
-        if self.tag is None:
-            raise ValueError("invalid HTML: no tag")
-        if self.children is None:
-            raise ValueError("invalid HTML: no children")
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        parts = []
+        serialize(self, parts.append)
+        return "".join(parts)
 
     def __repr__(self):
         return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
+
+
+def serialize(node, write):
+    # walk the tree with an explicit stack so deep nesting can't hit the
+    # recursion limit; closing tags are pushed as plain strings
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            write(item)
+        elif isinstance(item, ParentNode):
+            if item.tag is None:
+                raise ValueError("invalid HTML: no tag")
+            if item.children is None:
+                raise ValueError("invalid HTML: no children")
+            write(f"<{item.tag}{item.props_to_html()}>")
+            stack.append(f"</{item.tag}>")
+            stack.extend(reversed(item.children))
+        else:
+            write(item.to_html())
+
+
+def write_html(node, file):
+    serialize(node, file.write)
@@ -1,24 +1,107 @@
 import re
+from functools import lru_cache
 
 from textnode import TextNode, TextType
 
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+MARKUP_PATTERN = re.compile(r"\*\*|_|`|!\[|\[")
+MARKUP_CHARS_PATTERN = re.compile(r"[*_`\[]")
+DELIMITER_TYPES = {
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    if MARKUP_CHARS_PATTERN.search(text) is None:
+        # plain prose, the common case
+        if text == "":
+            return []
+        return [TextNode(text, TextType.TEXT)]
+
+    # one left-to-right scan: plain text accumulates between markup tokens,
+    # and each token either closes into a node or is kept as literal text
+    nodes = []
+    text_start = 0
+    search_start = 0
+    while True:
+        match = MARKUP_PATTERN.search(text, search_start)
+        if match is None:
+            break
+        start = match.start()
+        token = match.group()
+        if token in DELIMITER_TYPES:
+            end = text.find(token, match.end())
+            if end == -1:
+                raise ValueError("invalid markdown, formatted section not closed")
+            new_node = None
+            if end > match.end():
+                new_node = TextNode(text[match.end() : end], DELIMITER_TYPES[token])
+            next_start = end + len(token)
+        else:
+            if token == "![":
+                element = IMAGE_PATTERN.match(text, start)
+                text_type = TextType.IMAGE
+            else:
+                element = LINK_PATTERN.match(text, start)
+                text_type = TextType.LINK
+            if element is None:
+                search_start = start + 1
+                continue
+            new_node = TextNode(element.group(1), text_type, element.group(2))
+            next_start = element.end()
+        if start > text_start:
+            nodes.append(TextNode(text[text_start:start], TextType.TEXT))
+        if new_node is not None:
+            nodes.append(new_node)
+        text_start = search_start = next_start
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
     return nodes
 
 
+# short spans (list items, nav links, table of contents entries) repeat
+# across a site, so their parse is shared; long paragraphs rarely repeat and
+# would only bloat the memo
+MEMO_MAX_ENTRIES = 16384
+MEMO_MAX_TEXT_LENGTH = 256
+
+
+def memo_text_to_textnodes(text):
+    if len(text) > MEMO_MAX_TEXT_LENGTH:
+        return tuple(text_to_textnodes(text))
+    return memo_parse(text)
+
+
+@lru_cache(maxsize=MEMO_MAX_ENTRIES)
+def memo_parse(text):
+    return tuple(text_to_textnodes(text))
+
+
+def memo_stats():
+    info = memo_parse.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "entries": info.currsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
+        if delimiter not in old_node.text:
+            if old_node.text != "":
+                new_nodes.append(old_node)
+            continue
         split_nodes = []
         sections = old_node.text.split(delimiter)
         if len(sections) % 2 == 0:
@@ -89,12 +172,8 @@ def split_nodes_link(old_nodes):
 
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
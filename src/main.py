@@ -1,31 +1,550 @@
 import os
+import argparse
 import sys
-import shutil
-
-from copystatic import copy_files_recursive
-from gencontent import generate_pages_recursive
 
 
 dir_path_static = "./static"
 dir_path_public = "./docs"
 dir_path_content = "./content"
 template_path = "./template.html"
+manifest_path = "./.build-manifest.json"
+render_cache_path = "./.render-cache.sqlite"
+
+
+# each command's imports happen inside it, so a command never pays for the
+# modules only another one needs
+COMMANDS = {
+    "build": "build the whole site (the default command)",
+    "render-one": "render a single Markdown file or stdin to stdout or a file",
+    "check": "render every page in memory and report errors and broken links",
+}
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        # a bare `main.py [basepath] [options]` is a build
+        argv = ["build", *argv]
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+    command_parsers = {}
+    for name, summary in COMMANDS.items():
+        command_parsers[name] = subparsers.add_parser(
+            name, help=summary, description=f"{summary.capitalize()}."
+        )
+    # only the chosen command's options are set up
+    command = argv[0]
+    if command == "build":
+        add_build_arguments(command_parsers["build"])
+    elif command == "render-one":
+        add_render_one_arguments(command_parsers["render-one"])
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        check_build_args(command_parsers["build"], args)
+    return args
+
+
+def add_build_arguments(build_parser):
+    from copystatic import LINK_MODES
+
+    build_parser.add_argument("basepath", nargs="?", default="/")
+    build_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rebuild pages and assets whose sources changed",
+    )
+    build_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render pages across N worker processes (0 uses every CPU)",
+    )
+    build_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="parse and write each page one block at a time to bound memory",
+    )
+    build_parser.add_argument(
+        "--static-jobs",
+        type=int,
+        default=8,
+        metavar="N",
+        help="copy static assets with N threads",
+    )
+    build_parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help="how changed static assets are placed in the output directory",
+    )
+    build_parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="collapse whitespace in pages as they are written, leaving <pre> blocks alone",
+    )
+    build_parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="write .gz (and .br when brotli is installed) copies of HTML and CSS outputs",
+    )
+    build_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each pipeline stage and page and print a report",
+    )
+    build_parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="number of slowest pages to list in the profile report",
+    )
+    build_parser.add_argument(
+        "--profile-trace",
+        metavar="PATH",
+        help="also write a Chrome trace-event JSON file of the profile",
+    )
+    build_parser.add_argument(
+        "--render-cache",
+        action="store_true",
+        help="reuse rendered HTML for identical blocks within and across builds",
+    )
+    build_parser.add_argument(
+        "--render-cache-size",
+        type=int,
+        default=100_000,
+        metavar="N",
+        help="keep at most N fragments, evicting the least recently used",
+    )
+    build_parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="empty the render cache and exit",
+    )
+    build_parser.add_argument(
+        "--bounded",
+        action="store_true",
+        help="stream pages through a fixed-size window to cap memory on huge sites",
+    )
+    build_parser.add_argument(
+        "--window",
+        type=int,
+        metavar="N",
+        help="pages in flight with --bounded (default: 2 per job)",
+    )
+    build_parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="print why each page is rebuilt by an incremental build",
+    )
+    build_parser.add_argument(
+        "--dump-plan",
+        metavar="PATH",
+        help="write the scanned pages and assets to a JSON file",
+    )
+    build_parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="render only shard I of N of the pages (shard 1 also copies static/)",
+    )
+    build_parser.add_argument(
+        "--out",
+        metavar="DIR",
+        help="output directory (default docs/, or docs-shard-I-of-N/ with --shard)",
+    )
+    build_parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="DIR",
+        help="combine shard output directories into the output directory and exit",
+    )
+
+
+def check_build_args(build_parser, args):
+    if args.shard is not None:
+        from shard import parse_shard
+
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            build_parser.error(str(e))
+        if args.incremental:
+            build_parser.error("--incremental can't be combined with --shard")
+        if args.out is None:
+            args.out = f"{dir_path_public}-shard-{args.shard[0]}-of-{args.shard[1]}"
+    if args.out is None:
+        args.out = dir_path_public
+    if args.incremental and args.out != dir_path_public:
+        build_parser.error(
+            "--incremental always builds into the default output directory"
+        )
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.bounded:
+        if args.incremental or args.dump_plan:
+            build_parser.error(
+                "--bounded can't be combined with --incremental or --dump-plan"
+            )
+        if args.window is None:
+            args.window = args.jobs * 2
+        if args.window < 1:
+            build_parser.error("--window must be at least 1")
+        # the whole Markdown and HTML of a page are never held at once
+        args.stream = True
+    elif args.window is not None:
+        build_parser.error("--window only applies to --bounded builds")
+
+
+def add_render_one_arguments(render_parser):
+    render_parser.add_argument(
+        "source",
+        nargs="?",
+        default="-",
+        metavar="SOURCE",
+        help="Markdown file to render (default: - for stdin)",
+    )
+    render_parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        metavar="DEST",
+        help="file to write the page to (default: - for stdout)",
+    )
+    render_parser.add_argument("--basepath", default="/")
+    render_parser.add_argument("--template", default=template_path, metavar="PATH")
+    render_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write each block as soon as it is parsed",
+    )
+    render_parser.add_argument("--minify", action="store_true")
 
 
 def main():
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    args = parse_args()
+    if args.command == "build":
+        run_build(args)
+    elif args.command == "render-one":
+        render_one(args)
+    elif args.command == "check":
+        check(args)
+
+
+def render_one(args):
+    from template import load_template
+
+    # errors exit as "PATH: message" without a traceback, for editor plugins
+    try:
+        template = load_template(args.template, args.basepath, args.minify)
+        source = sys.stdin if args.source == "-" else open(args.source, "r")
+    except OSError as e:
+        raise SystemExit(os_error_message(e, args.source))
+    try:
+        if args.output == "-":
+            render_one_to(source, template, sys.stdout.write, args.stream)
+        else:
+            render_one_file(source, template, args.output, args.stream)
+    except ValueError as e:
+        raise SystemExit(f"{args.source}: {e}")
+    except OSError as e:
+        raise SystemExit(os_error_message(e, args.source))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def os_error_message(e, path):
+    if e.filename is not None:
+        path = e.filename
+    return f"{path}: {e.strerror or e}"
+
+
+def render_one_to(source, template, write, stream=False):
+    from render import render_markdown, stream_markdown
+
+    if stream:
+        stream_markdown(source, template, write)
+    else:
+        write(render_markdown(source.read(), template))
+
+
+def render_one_file(source, template, dest_path, stream=False):
+    from output import make_parent_dirs, replace_if_changed, temp_path_for
+
+    # written next to the destination and renamed over it, and skipped when
+    # the bytes are unchanged, like pages written by a build
+    make_parent_dirs(dest_path)
+    tmp_path = temp_path_for(dest_path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as to_file:
+            render_one_to(source, template, to_file.write, stream)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return replace_if_changed(tmp_path, dest_path)
+
+
+def check(args):
+    from check import check_site
+
+    problems, pages = check_site(dir_path_content, dir_path_static, template_path)
+    for path, problem in problems:
+        print(f" ! {path}: {problem}")
+    if problems:
+        raise SystemExit(f"{len(problems)} problems found in {pages} pages")
+    print(f"{pages} pages checked, no problems found")
+
+
+def run_build(args):
+    from output import WriteStats
+
+    basepath = args.basepath
+    stats = WriteStats()
+
+    if args.clear_cache:
+        from rendercache import RenderCache
+
+        cache = RenderCache(render_cache_path)
+        cache.clear()
+        cache.close()
+        print(f"Cleared render cache {render_cache_path}")
+        return
+
+    if args.merge:
+        from shard import merge_shards
+
+        print(f"Merging {len(args.merge)} shards into {args.out}...")
+        try:
+            removed = merge_shards(
+                args.merge, args.out, args.static_jobs, args.link_mode, stats
+            )
+        except ValueError as e:
+            raise SystemExit(f"Merge failed: {e}")
+        for path in removed:
+            print(f" - {path}")
+        print(f"{stats.written} files written, {stats.skipped} unchanged")
+        return
+
+    cache = None
+    if args.render_cache:
+        from rendercache import RenderCache
+
+        cache = RenderCache(render_cache_path, args.render_cache_size)
+
+    profiler = None
+    if args.profile or args.profile_trace:
+        from profiler import Profiler
+
+        profiler = Profiler(trace=args.profile_trace is not None)
+        profiler.install()
+        if args.jobs > 1:
+            print("Profiling renders pages in this process, ignoring --jobs")
+            args.jobs = 1
+
+    from buildplan import BuildPlan, iter_tree, make_plan
+
+    if args.bounded:
+        # pages and assets are walked lazily as the pipeline pulls them
+        plan = BuildPlan(
+            iter_tree(dir_path_content, args.out, ".html"),
+            iter_tree(dir_path_static, args.out),
+        )
+    else:
+        plan = make_plan(dir_path_content, dir_path_static, args.out)
+    if args.shard is not None:
+        from shard import remove_shard_marker, select_shard
+
+        index, count = args.shard
+        remove_shard_marker(args.out)
+        plan = select_shard(plan, dir_path_content, index, count)
+        if not args.bounded:
+            print(f"Shard {index}/{count}: {plan}")
+    if args.dump_plan:
+        plan.save(args.dump_plan)
+        print(f"Build plan written to {args.dump_plan}: {plan}")
+
+    if args.explain and not args.incremental:
+        print("--explain applies to incremental builds, a full build renders every page")
+    if args.incremental:
+        build_incremental(
+            basepath,
+            args.jobs,
+            args.stream,
+            stats,
+            cache=cache,
+            explain=args.explain,
+            plan=plan,
+            compress=args.compress,
+            minify=args.minify,
+            static_jobs=args.static_jobs,
+            link_mode=args.link_mode,
+        )
     else:
-        basepath = "/"
-    print("Deleting public directory...")
-    if os.path.exists(dir_path_public):
-        shutil.rmtree(dir_path_public)
+        build_full(
+            basepath,
+            args.jobs,
+            args.stream,
+            stats,
+            static_jobs=args.static_jobs,
+            link_mode=args.link_mode,
+            cache=cache,
+            plan=plan,
+            dest_dir_path=args.out,
+            compress=args.compress,
+            minify=args.minify,
+            window=args.window,
+        )
+    if args.shard is not None:
+        from shard import write_shard_marker
+
+        write_shard_marker(args.out, *args.shard)
+
+    print(f"{stats.written} files written, {stats.skipped} unchanged")
+    if args.bounded:
+        from pipeline import peak_rss
+
+        own, workers = peak_rss()
+        report = f"Peak RSS: {own / 2**20:.1f} MB"
+        if args.jobs > 1:
+            report += f", largest worker {workers / 2**20:.1f} MB"
+        print(report)
+    if cache is not None:
+        cache.close()
+        if cache.hits or cache.misses:
+            print(f"Render cache: {cache.hits} hits, {cache.misses} misses")
+
+    if profiler is not None:
+        profiler.uninstall()
+        profiler.report(args.profile_top)
+        if args.profile_trace:
+            profiler.dump_trace(args.profile_trace)
+            print(f"Trace written to {args.profile_trace}")
+
+
+def build_full(
+    basepath,
+    jobs=1,
+    stream=False,
+    stats=None,
+    static_jobs=8,
+    link_mode="copy",
+    cache=None,
+    plan=None,
+    dest_dir_path=dir_path_public,
+    compress=False,
+    minify=False,
+    window=None,
+):
+    from buildplan import make_plan
+    from compress import compress_outputs
+    from copystatic import copy_assets
+    from gencontent import generate_pages
+    from output import WriteStats, prune_outputs
+
+    if stats is None:
+        stats = WriteStats()
+    if plan is None:
+        plan = make_plan(dir_path_content, dir_path_static, dest_dir_path)
+    # the manifest only describes the default output directory
+    if dest_dir_path == dir_path_public and os.path.exists(manifest_path):
+        os.remove(manifest_path)
 
     print("Copying static files to public directory...")
-    copy_files_recursive(dir_path_static, dir_path_public)
+    copy_assets(plan.assets, static_jobs, link_mode, stats)
 
     print("Generating content...")
-    generate_pages_recursive(dir_path_content, template_path, dir_path_public, basepath)
+    if window is None:
+        pages = plan.page_pairs()
+    else:
+        pages = ((entry.source, entry.dest) for entry in plan.pages)
+    generate_pages(
+        pages,
+        template_path,
+        basepath,
+        jobs,
+        stream,
+        stats,
+        cache,
+        minify=minify,
+        window=window,
+    )
+
+    if compress:
+        print("Compressing outputs...")
+        compress_outputs(stats.outputs, stats=stats)
+
+    print("Removing stale files from public directory...")
+    for path in prune_outputs(dest_dir_path, stats.outputs):
+        print(f" - {path}")
+
+
+def build_incremental(
+    basepath,
+    jobs=1,
+    stream=False,
+    stats=None,
+    cache=None,
+    explain=False,
+    plan=None,
+    compress=False,
+    minify=False,
+    static_jobs=8,
+    link_mode="copy",
+):
+    from buildplan import make_plan
+    from compress import compress_outputs, remove_stale_siblings
+    from copystatic import copy_files_incremental
+    from gencontent import generate_pages_incremental
+    from manifest import load_manifest, save_manifest
+    from output import WriteStats
+
+    if stats is None:
+        stats = WriteStats()
+    if plan is None:
+        plan = make_plan(dir_path_content, dir_path_static, dir_path_public)
+    manifest = load_manifest(manifest_path)
+
+    print("Copying changed static files to public directory...")
+    changed_assets = copy_files_incremental(
+        dir_path_static,
+        dir_path_public,
+        manifest,
+        stats,
+        plan.assets,
+        static_jobs,
+        link_mode,
+    )
+
+    print("Generating changed content...")
+    generate_pages_incremental(
+        dir_path_content,
+        template_path,
+        dir_path_public,
+        basepath,
+        manifest,
+        jobs,
+        stream,
+        stats,
+        cache,
+        changed_assets,
+        explain,
+        plan.pages,
+        minify,
+    )
+
+    if compress:
+        print("Compressing outputs...")
+        compress_outputs(stats.outputs, stats=stats)
+    else:
+        for path in remove_stale_siblings(stats.outputs):
+            print(f" - {path}")
+
+    save_manifest(manifest_path, manifest)
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+
+
+MANIFEST_VERSION = 2
+
+
+def new_manifest():
+    return {
+        "version": MANIFEST_VERSION,
+        "basepath": None,
+        "minify": False,
+        "template": None,
+        "pages": {},
+        "static": {},
+    }
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return new_manifest()
+    with open(path, "r") as f:
+        try:
+            manifest = json.load(f)
+        except ValueError:
+            return new_manifest()
+    if manifest.get("version") != MANIFEST_VERSION:
+        return new_manifest()
+    return manifest
+
+
+def save_manifest(path, manifest):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def entry_hash(entry, old_file):
+    # a file is only read again when its size or mtime moved since the build
+    # that hashed it, the same check a full build uses to skip assets
+    if (
+        old_file is not None
+        and old_file.get("size") == entry.size
+        and old_file.get("mtime_ns") == entry.mtime_ns
+    ):
+        return old_file["hash"]
+    return hash_file(entry.source)
+
+
+def remove_output(path, root):
+    # pre-compressed siblings go with their output
+    for remove_path in (path, f"{path}.gz", f"{path}.br"):
+        if os.path.exists(remove_path):
+            os.remove(remove_path)
+    # drop directories left empty by the removal, but never the output root
+    root = os.path.abspath(root)
+    dir_path = os.path.dirname(os.path.abspath(path))
+    while dir_path.startswith(root + os.sep) and os.path.isdir(dir_path):
+        if os.listdir(dir_path):
+            break
+        os.rmdir(dir_path)
+        dir_path = os.path.dirname(dir_path)
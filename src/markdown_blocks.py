@@ -1,7 +1,7 @@
 from enum import Enum
 
-from htmlnode import ParentNode
-from inline_markdown import text_to_textnodes
+from htmlnode import LeafNode, ParentNode
+from inline_markdown import memo_text_to_textnodes
 from textnode import text_node_to_html_node, TextNode, TextType
 
 
@@ -25,6 +25,24 @@ def markdown_to_blocks(markdown):
     return filtered_blocks
 
 
+def iter_blocks(lines):
+    # streaming counterpart of markdown_to_blocks: splits on "\n\n" as the
+    # text arrives, so it yields exactly the same blocks, including the
+    # empty ones left by whitespace-only lines
+    buffer = ""
+    for line in lines:
+        buffer += line
+        # a new separator can only end inside the line just added
+        if "\n\n" not in buffer[-len(line) - 1 :]:
+            continue
+        *blocks, buffer = buffer.split("\n\n")
+        for block in blocks:
+            if block != "":
+                yield block.strip()
+    if buffer != "":
+        yield buffer.strip()
+
+
 def block_to_block_type(block):
     lines = block.split("\n")
 
@@ -52,15 +70,36 @@ def block_to_block_type(block):
     return BlockType.PARAGRAPH
 
 
-def markdown_to_html_node(markdown):
+def markdown_to_html_node(markdown, cache=None):
     blocks = markdown_to_blocks(markdown)
     children = []
     for block in blocks:
-        html_node = block_to_html_node(block)
+        if cache is None:
+            html_node = block_to_html_node(block)
+        else:
+            html_node = LeafNode(None, cached_block_html(block, cache))
         children.append(html_node)
     return ParentNode("div", children, None)
 
 
+def write_markdown_html(lines, write, cache=None):
+    write("<div>")
+    for block in iter_blocks(lines):
+        if cache is None:
+            write(block_to_html_node(block).to_html())
+        else:
+            write(cached_block_html(block, cache))
+    write("</div>")
+
+
+def cached_block_html(block, cache):
+    html = cache.get(block)
+    if html is None:
+        html = block_to_html_node(block).to_html()
+        cache.put(block, html)
+    return html
+
+
 def block_to_html_node(block):
     block_type = block_to_block_type(block)
     if block_type == BlockType.PARAGRAPH:
@@ -79,7 +118,7 @@ def block_to_html_node(block):
 
 
 def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
+    text_nodes = memo_text_to_textnodes(text)
     children = []
     for text_node in text_nodes:
         html_node = text_node_to_html_node(text_node)
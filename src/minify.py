@@ -0,0 +1,93 @@
+import re
+
+
+# HTML whitespace only: \s would also match U+00A0 and other Unicode spaces,
+# which authors type on purpose and which do render
+TAG_PATTERN = re.compile(r"<(/?)([A-Za-z!][^ \t\n\r\f/>]*)[^>]*>")
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r\f]+")
+
+# whitespace inside these is significant, so it is copied through untouched
+RAW_TAGS = frozenset(("pre", "textarea", "script", "style"))
+
+# whitespace next to these tags never renders, so it is dropped instead of
+# collapsed to a single space
+BLOCK_TAGS = frozenset(
+    "!doctype html head body title meta link script style article section header "
+    "footer nav main div p h1 h2 h3 h4 h5 h6 ul ol li blockquote pre table thead "
+    "tbody tr td th hr br".split()
+)
+
+
+class Minifier:
+    # collapses whitespace in HTML as it is written, one chunk at a time;
+    # a tag split across chunks is held back until its closing ">" arrives
+    def __init__(self, write):
+        self.write_output = write
+        self.held = ""
+        self.raw_tag = None
+        self.pending_space = False
+        self.after_block = True
+
+    def write(self, html):
+        html = self.held + html
+        self.held = ""
+        start = html.rfind("<")
+        if start > html.rfind(">"):
+            html, self.held = html[:start], html[start:]
+        position = 0
+        for match in TAG_PATTERN.finditer(html):
+            self.text(html[position : match.start()])
+            self.tag(match.group(0), match.group(1) == "/", match.group(2).lower())
+            position = match.end()
+        self.text(html[position:])
+
+    def close(self):
+        held, self.held = self.held, ""
+        self.text(held)
+        self.pending_space = False
+
+    def text(self, text):
+        if text == "":
+            return
+        if self.raw_tag is not None:
+            self.write_output(text)
+            return
+        collapsed = WHITESPACE_PATTERN.sub(" ", text)
+        stripped = collapsed.strip(" ")
+        if stripped == "":
+            self.pending_space = True
+            return
+        if collapsed[0] == " ":
+            self.pending_space = True
+        self.flush_space()
+        self.write_output(stripped)
+        self.after_block = False
+        self.pending_space = collapsed[-1] == " "
+
+    def tag(self, tag, closing, name):
+        if self.raw_tag is not None:
+            self.write_output(tag)
+            if closing and name == self.raw_tag:
+                self.raw_tag = None
+            return
+        if name in BLOCK_TAGS:
+            self.pending_space = False
+        else:
+            self.flush_space()
+        self.write_output(tag)
+        self.after_block = name in BLOCK_TAGS
+        if not closing and name in RAW_TAGS:
+            self.raw_tag = name
+
+    def flush_space(self):
+        if self.pending_space and not self.after_block:
+            self.write_output(" ")
+        self.pending_space = False
+
+
+def minify_html(html):
+    parts = []
+    minifier = Minifier(parts.append)
+    minifier.write(html)
+    minifier.close()
+    return "".join(parts)
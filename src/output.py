@@ -0,0 +1,95 @@
+import filecmp
+import os
+import shutil
+import threading
+
+
+class WriteStats:
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self.outputs = set()
+
+    def record(self, path, written):
+        self.outputs.add(os.path.abspath(path))
+        if written:
+            self.written += 1
+        else:
+            self.skipped += 1
+
+    def __repr__(self):
+        return f"WriteStats(written: {self.written}, skipped: {self.skipped})"
+
+
+def temp_path_for(path):
+    # unique per process and thread, and in the same directory so that
+    # os.replace stays a single atomic rename
+    dir_path, filename = os.path.split(path)
+    return os.path.join(
+        dir_path, f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+
+
+def make_parent_dirs(path):
+    dir_path = os.path.dirname(path)
+    if dir_path != "":
+        os.makedirs(dir_path, exist_ok=True)
+
+
+def write_if_changed(path, text):
+    data = text.encode("utf-8")
+    if os.path.isfile(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    make_parent_dirs(path)
+    tmp_path = temp_path_for(path)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def replace_if_changed(tmp_path, path):
+    if os.path.isfile(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def copy_if_changed(from_path, dest_path):
+    if os.path.isfile(dest_path) and filecmp.cmp(from_path, dest_path, shallow=False):
+        return False
+    make_parent_dirs(dest_path)
+    tmp_path = temp_path_for(dest_path)
+    shutil.copy(from_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+    return True
+
+
+def prune_outputs(root, keep):
+    # iterative post-order walk, so deep trees can't hit the recursion limit;
+    # symlinked directories are listed like os.walk does but never entered
+    removed = []
+    if not os.path.isdir(root):
+        return removed
+    stack = [(root, False)]
+    while stack:
+        dir_path, visited = stack.pop()
+        if visited:
+            if dir_path != root and not os.listdir(dir_path):
+                os.rmdir(dir_path)
+            continue
+        stack.append((dir_path, True))
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append((entry.path, False))
+                    continue
+                path = os.path.abspath(entry.path)
+                if path not in keep:
+                    os.remove(path)
+                    removed.append(path)
+    return removed
@@ -0,0 +1,31 @@
+import sys
+from collections import deque
+
+
+def bounded_map(executor, func, items, window):
+    # like executor.map, but items are only pulled from the iterable while
+    # fewer than window are in flight, so a lazy walk is never run ahead and
+    # finished results are yielded, in order, as soon as they are ready
+    in_flight = deque()
+    for item in items:
+        if len(in_flight) >= window:
+            yield finish(in_flight.popleft())
+        in_flight.append((item, executor.submit(func, item)))
+    while in_flight:
+        yield finish(in_flight.popleft())
+
+
+def finish(pending):
+    item, future = pending
+    return item, future.result()
+
+
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS; the children
+    # figure is the largest single worker process that has exited
+    import resource
+
+    scale = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return own, children
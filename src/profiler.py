@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+import copystatic
+import gencontent
+import htmlnode
+import inline_markdown
+import markdown_blocks
+import template
+
+
+# (owner, attribute, stage): every call goes through a module or class
+# attribute lookup, so replacing the attribute times it and restoring it
+# leaves nothing behind when profiling is off
+STAGES = (
+    (gencontent, "read_markdown", "read"),
+    (markdown_blocks, "markdown_to_blocks", "markdown_to_blocks"),
+    (markdown_blocks, "block_to_html_node", "block_to_html_node"),
+    (markdown_blocks, "memo_text_to_textnodes", "text_to_textnodes"),
+    (htmlnode.ParentNode, "to_html", "to_html"),
+    (template.Template, "render", "template"),
+    (template.Template, "stream", "template"),
+    (gencontent, "write_if_changed", "write"),
+    (gencontent, "replace_if_changed", "write"),
+    (copystatic, "sync_file", "copy_static"),
+    (copystatic, "copy_if_changed", "copy_static"),
+)
+
+
+class Profiler:
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.stages = {}
+        self.pages = []
+        self.events = []
+        self.originals = []
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def wrap(self, name, func, page=False):
+        stage = self.stages.setdefault(name, [0, 0.0])
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self.lock:
+                    stage[0] += 1
+                    stage[1] += elapsed
+                    if page:
+                        self.pages.append((str(args[0]), elapsed))
+                    if self.trace:
+                        self.events.append(
+                            {
+                                "name": str(args[0]) if page else name,
+                                "cat": "page" if page else "stage",
+                                "ph": "X",
+                                "ts": (started - self.started) * 1e6,
+                                "dur": elapsed * 1e6,
+                                "pid": os.getpid(),
+                                "tid": threading.get_ident(),
+                            }
+                        )
+
+        return timed
+
+    def install(self):
+        targets = [(owner, attr, name, False) for owner, attr, name in STAGES]
+        targets.append((gencontent, "render_page", "page", True))
+        for owner, attr, name, page in targets:
+            original = getattr(owner, attr)
+            self.originals.append((owner, attr, original))
+            setattr(owner, attr, self.wrap(name, original, page))
+
+    def uninstall(self):
+        for owner, attr, original in reversed(self.originals):
+            setattr(owner, attr, original)
+        self.originals = []
+
+    def report(self, top=10):
+        total = time.perf_counter() - self.started
+        print(f"Profile: {total * 1000:.1f} ms total, {len(self.pages)} pages")
+        print("Stages (inclusive wall time, nested stages overlap):")
+        ordered = sorted(self.stages.items(), key=lambda item: -item[1][1])
+        for name, (calls, seconds) in ordered:
+            if calls == 0:
+                continue
+            print(f"  {name:<20}{seconds * 1000:>10.1f} ms{calls:>10} calls")
+        memo = inline_markdown.memo_stats()
+        print(
+            f"Inline memo: {memo['hits']} hits, {memo['misses']} misses, "
+            f"{memo['hit_rate']:.1%} hit rate, {memo['entries']} entries"
+        )
+        if self.pages:
+            print(f"Slowest {min(top, len(self.pages))} pages:")
+            for from_path, seconds in sorted(self.pages, key=lambda p: -p[1])[:top]:
+                print(f"  {seconds * 1000:>10.1f} ms  {from_path}")
+
+    def dump_trace(self, path):
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events}, f)
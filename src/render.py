@@ -0,0 +1,57 @@
+from itertools import chain
+
+from depgraph import collecting_writer, find_references
+from markdown_blocks import markdown_to_html_node, write_markdown_html
+
+
+def render_markdown(markdown_content, template, cache=None, references=None):
+    node = markdown_to_html_node(markdown_content, cache)
+    html = node.to_html()
+    if references is not None:
+        references.extend(template.references)
+        references.extend(find_references(html))
+
+    title = extract_title(markdown_content)
+    return template.render(title, html)
+
+
+def stream_markdown(lines, template, write, cache=None, references=None):
+    # a single pass over lines, so it works on pipes as well as files
+    title, lines = peek_title(lines)
+
+    if references is not None:
+        references.extend(template.references)
+
+    def write_content(write):
+        if references is not None:
+            write = collecting_writer(write, references)
+        write_markdown_html(lines, write, cache)
+
+    template.stream(write, title, write_content)
+
+
+def peek_title(lines):
+    # only the lines up to the title are held in memory, and they are
+    # replayed ahead of the rest of the input
+    lines = iter(lines)
+    seen = []
+
+    def recorded():
+        for line in lines:
+            seen.append(line)
+            yield line
+
+    title = extract_title_lines(recorded())
+    return title, chain(seen, lines)
+
+
+def extract_title(md):
+    return extract_title_lines(md.split("\n"))
+
+
+def extract_title_lines(lines):
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.startswith("# "):
+            return line[2:]
+    raise ValueError("no title found")
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+
+# bump whenever block or inline rendering changes so stale fragments are
+# never served; the version is part of every key
+PARSER_VERSION = "1"
+
+
+class RenderCache:
+    def __init__(self, path, max_entries=100_000, flush_every=1000):
+        self.path = path
+        self.max_entries = max_entries
+        # new fragments and touched keys are written out in batches, so a
+        # long build never holds more than flush_every of them in memory
+        self.flush_every = flush_every
+        self.memory = OrderedDict()
+        self.pending = {}
+        self.touched = set()
+        self.hits = 0
+        self.misses = 0
+        dir_path = os.path.dirname(path)
+        if dir_path != "":
+            os.makedirs(dir_path, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fragments "
+            "(key TEXT PRIMARY KEY, html TEXT NOT NULL, used REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)"
+        )
+
+    def key(self, block):
+        data = f"{PARSER_VERSION}\0{block}".encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, block):
+        key = self.key(block)
+        html = self.memory.get(key)
+        if html is None:
+            row = self.connection.execute(
+                "SELECT html FROM fragments WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            html = row[0]
+            self.remember(key, html)
+        else:
+            self.memory.move_to_end(key)
+        self.hits += 1
+        self.touched.add(key)
+        if len(self.touched) >= self.flush_every:
+            self.flush()
+        return html
+
+    def put(self, block, html):
+        key = self.key(block)
+        self.remember(key, html)
+        self.pending[key] = html
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def remember(self, key, html):
+        self.memory[key] = html
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def flush(self):
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fragments (key, html, used) VALUES (?, ?, ?)",
+                [(key, html, now) for key, html in self.pending.items()],
+            )
+            self.connection.executemany(
+                "UPDATE fragments SET used = ? WHERE key = ?",
+                [(now, key) for key in self.touched if key not in self.pending],
+            )
+        self.pending = {}
+        self.touched = set()
+
+    def evict(self):
+        # least recently used fragments go first
+        with self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM fragments WHERE key IN ("
+                "SELECT key FROM fragments ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        return cursor.rowcount
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM fragments")
+        self.memory.clear()
+        self.pending = {}
+        self.touched = set()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM fragments").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.evict()
+        self.connection.close()
+
+    def __repr__(self):
+        return f"RenderCache({self.path}, hits: {self.hits}, misses: {self.misses})"
@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from builder import Builder
+from main import template_path
+from template import load_template
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Render Markdown to pages over a JSON-lines protocol."
+    )
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--template", default=template_path, metavar="PATH")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render across N worker processes (default renders in this process)",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="listen on a Unix socket instead of stdin/stdout",
+    )
+    parser.add_argument("--minify", action="store_true")
+    return parser.parse_args()
+
+
+worker_builder = None
+
+
+def init_worker(template):
+    global worker_builder
+    worker_builder = Builder(template)
+
+
+def render_worker(markdown):
+    started = time.perf_counter()
+    html = worker_builder.render(markdown)
+    return html, (time.perf_counter() - started) * 1000
+
+
+class RenderServer:
+    # the template is compiled once and the inline memo stays warm across
+    # requests, so a render costs only the Markdown itself
+    def __init__(self, template, jobs=1):
+        self.builder = Builder(template)
+        self.executor = None
+        if jobs > 1:
+            self.executor = ProcessPoolExecutor(
+                max_workers=jobs, initializer=init_worker, initargs=(template,)
+            )
+            # spawn every worker up front so no request pays for the start-up
+            warmup = [
+                self.executor.submit(render_worker, "# Warm up") for _ in range(jobs)
+            ]
+            for future in warmup:
+                future.result()
+
+    def handle(self, line, respond):
+        # every request gets exactly one response, whatever goes wrong
+        started = time.perf_counter()
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            markdown = request["markdown"]
+        except (ValueError, KeyError, AttributeError) as e:
+            respond(response(None, started, error=f"invalid request: {e!r}"))
+            return None
+        if not isinstance(markdown, str):
+            error = f"invalid request: markdown must be a string, not {markdown!r}"
+            respond(response(request_id, started, error=error))
+            return None
+        if self.executor is None:
+            try:
+                html, render_ms = render(self.builder, markdown)
+            except Exception as e:
+                respond(response(request_id, started, error=render_error(e)))
+            else:
+                respond(response(request_id, started, html, render_ms))
+            return None
+
+        def done(future):
+            try:
+                html, render_ms = future.result()
+            except Exception as e:
+                respond(response(request_id, started, error=render_error(e)))
+            else:
+                respond(response(request_id, started, html, render_ms))
+
+        try:
+            future = self.executor.submit(render_worker, markdown)
+        except Exception as e:
+            # a broken pool refuses new work
+            respond(response(request_id, started, error=render_error(e)))
+            return None
+        future.add_done_callback(done)
+        return future
+
+    def serve_stream(self, infile, outfile):
+        # responses carry the request id and may arrive out of order when
+        # rendering across worker processes
+        lock = threading.Lock()
+
+        def respond(message):
+            data = json.dumps(message).encode("utf-8") + b"\n"
+            with lock:
+                outfile.write(data)
+                outfile.flush()
+
+        pending = set()
+        for line in infile:
+            if line.strip() == b"":
+                continue
+            future = self.handle(line, respond)
+            if future is not None:
+                pending.add(future)
+                future.add_done_callback(pending.discard)
+        wait(list(pending))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def render(builder, markdown):
+    started = time.perf_counter()
+    html = builder.render(markdown)
+    return html, (time.perf_counter() - started) * 1000
+
+
+def render_error(e):
+    # ValueError is a problem with the page itself, anything else is a bug
+    # or a dead worker and keeps its type in the message
+    if isinstance(e, ValueError):
+        return str(e)
+    return f"render failed: {e!r}"
+
+
+def response(request_id, started, html=None, render_ms=None, error=None):
+    message = {"id": request_id}
+    if error is not None:
+        message["error"] = error
+    else:
+        message["html"] = html
+        message["render_ms"] = round(render_ms, 3)
+    message["ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return message
+
+
+class ConnectionHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.render_server.serve_stream(self.rfile, self.wfile)
+
+
+def serve_socket(render_server, path):
+    if os.path.exists(path):
+        os.remove(path)
+    server = socketserver.ThreadingUnixStreamServer(path, ConnectionHandler)
+    server.daemon_threads = True
+    server.render_server = render_server
+    print(f"Listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(path)
+
+
+def main():
+    args = parse_args()
+    # exit through the finally blocks on SIGTERM so pool workers and the
+    # socket file are cleaned up
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    template = load_template(args.template, args.basepath, args.minify)
+    render_server = RenderServer(template, max(1, args.jobs))
+    try:
+        if args.socket:
+            serve_socket(render_server, args.socket)
+        else:
+            print("Reading requests from stdin", file=sys.stderr)
+            render_server.serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        render_server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import filecmp
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from buildplan import BuildPlan, scan_tree
+from copystatic import LINK_MODES, sync_file
+from output import WriteStats, prune_outputs, write_if_changed
+from pipeline import bounded_map
+
+
+# written into a shard's output directory once its build has finished
+SHARD_MARKER = ".shard"
+
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard: {value}, expected i/N such as 1/4")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard: {value}, i must be between 1 and N")
+    return index, count
+
+
+def shard_of(relative_path, count):
+    # crc32 of the path relative to content/ is stable across machines and
+    # Python runs, and adding a page never moves the others to a new shard
+    key = relative_path.replace(os.sep, "/").encode("utf-8")
+    return zlib.crc32(key) % count + 1
+
+
+def select_shard(plan, dir_path_content, index, count):
+    pages = (
+        entry
+        for entry in plan.pages
+        if shard_of(os.path.relpath(entry.source, dir_path_content), count) == index
+    )
+    # a lazily walked plan stays lazy
+    if isinstance(plan.pages, list):
+        pages = list(pages)
+    # static assets are copied by the first shard only
+    assets = plan.assets if index == 1 else []
+    return BuildPlan(pages, assets)
+
+
+def write_shard_marker(dir_path, index, count):
+    write_if_changed(os.path.join(dir_path, SHARD_MARKER), f"{index}/{count}\n")
+
+
+def remove_shard_marker(dir_path):
+    # a build that fails part of the way leaves no marker behind
+    marker_path = os.path.join(dir_path, SHARD_MARKER)
+    if os.path.exists(marker_path):
+        os.remove(marker_path)
+
+
+def read_shard_marker(dir_path):
+    try:
+        with open(os.path.join(dir_path, SHARD_MARKER)) as f:
+            return parse_shard(f.read().strip())
+    except FileNotFoundError:
+        raise ValueError(f"{dir_path} is not a finished shard build")
+    except ValueError as e:
+        raise ValueError(f"{dir_path}: {e}")
+
+
+def check_shard_set(shard_dir_paths):
+    # merging an incomplete set would prune the missing shards' pages
+    shards = {}
+    counts = set()
+    for shard_dir_path in shard_dir_paths:
+        index, count = read_shard_marker(shard_dir_path)
+        counts.add(count)
+        if index in shards:
+            raise ValueError(
+                f"{shard_dir_path} and {shards[index]} are both shard {index}"
+            )
+        shards[index] = shard_dir_path
+    if len(counts) > 1:
+        counts = ", ".join(str(count) for count in sorted(counts))
+        raise ValueError(f"shards come from different shardings of {counts}")
+    for count in counts:
+        missing = [f"{i}/{count}" for i in range(1, count + 1) if i not in shards]
+        if missing:
+            raise ValueError(f"missing shards {', '.join(missing)}")
+
+
+def find_collisions(shard_dir_paths, dest_dir_path):
+    owners = {}
+    entries = []
+    collisions = []
+    for shard_dir_path in shard_dir_paths:
+        marker_path = os.path.join(shard_dir_path, SHARD_MARKER)
+        for entry in scan_tree(shard_dir_path, dest_dir_path):
+            if entry.source == marker_path:
+                continue
+            owner = owners.get(entry.dest)
+            if owner is not None:
+                collisions.append((entry.dest, owner, entry.source))
+                continue
+            owners[entry.dest] = entry.source
+            entries.append(entry)
+    return entries, collisions
+
+
+def merge_file(from_path, dest_path, link_mode="copy"):
+    # shard outputs are freshly written, so size and mtime always differ;
+    # only the bytes tell whether the published file changed
+    if os.path.isfile(dest_path) and filecmp.cmp(from_path, dest_path, shallow=False):
+        return False
+    return sync_file(from_path, dest_path, link_mode)
+
+
+def merge_shards(shard_dir_paths, dest_dir_path, jobs=8, link_mode="copy", stats=None):
+    if stats is None:
+        stats = WriteStats()
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"invalid link mode: {link_mode}")
+    for shard_dir_path in shard_dir_paths:
+        if not os.path.isdir(shard_dir_path):
+            raise ValueError(f"shard output {shard_dir_path} does not exist")
+    check_shard_set(shard_dir_paths)
+    entries, collisions = find_collisions(shard_dir_paths, dest_dir_path)
+    if collisions:
+        lines = [f"  {dest}: {first} and {second}" for dest, first, second in collisions]
+        raise ValueError(
+            f"{len(collisions)} outputs are written by more than one shard:\n"
+            + "\n".join(lines)
+        )
+    jobs = max(1, jobs)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = bounded_map(
+            executor,
+            lambda entry: merge_file(entry.source, entry.dest, link_mode),
+            entries,
+            jobs * 4,
+        )
+        for entry, written in results:
+            if written:
+                print(f" * {entry.source} -> {entry.dest}")
+            stats.record(entry.dest, written)
+    return prune_outputs(dest_dir_path, stats.outputs)
@@ -0,0 +1,74 @@
+import re
+
+from depgraph import find_references
+from minify import Minifier
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+
+
+class Template:
+    def __init__(self, source, basepath="/", minify=False):
+        self.basepath = basepath
+        self.minify = minify
+        self.segments = []
+        self.slots = []
+        # every page loads these, e.g. the stylesheet; taken before the base
+        # path rewrite so they match the references found in page content
+        self.references = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.add_segment(source[position : match.start()])
+            self.slots.append((len(self.segments), match.group(1)))
+            self.segments.append("")
+            position = match.end()
+        self.add_segment(source[position:])
+
+    def add_segment(self, text):
+        self.references.extend(find_references(text))
+        self.segments.append(self.rewrite(text))
+
+    def rewrite(self, text):
+        if self.basepath == "/":
+            return text
+        text = text.replace('href="/', f'href="{self.basepath}')
+        return text.replace('src="/', f'src="{self.basepath}')
+
+    def render(self, title, content):
+        if self.minify:
+            parts = []
+            self.stream(parts.append, title, lambda write: write(content))
+            return "".join(parts)
+        values = {"Title": self.rewrite(title), "Content": self.rewrite(content)}
+        parts = self.segments.copy()
+        for index, name in self.slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+    def stream(self, write, title, write_content):
+        minifier = None
+        if self.minify:
+            minifier = Minifier(write)
+            write = minifier.write
+        slot_names = dict(self.slots)
+        for index, segment in enumerate(self.segments):
+            name = slot_names.get(index)
+            if name == "Title":
+                write(self.rewrite(title))
+            elif name == "Content":
+                write_content(lambda html: write(self.rewrite(html)))
+            else:
+                write(segment)
+        if minifier is not None:
+            minifier.close()
+
+    def __repr__(self):
+        return (
+            f"Template({self.segments}, slots: {self.slots}, {self.basepath}, "
+            f"minify: {self.minify})"
+        )
+
+
+def load_template(template_path, basepath="/", minify=False):
+    with open(template_path, "r") as f:
+        return Template(f.read(), basepath, minify)
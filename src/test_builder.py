@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from builder import Builder, output_path, read_pages
+from template import Template
+
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css" /><main>{{ Content }}</main>'
+
+
+class TestBuilder(unittest.TestCase):
+    def test_render(self):
+        builder = Builder(TEMPLATE)
+        self.assertEqual(
+            builder.render("# Hello\n\nSome **bold** text"),
+            '<title>Hello</title><link href="/index.css" />'
+            "<main><div><h1>Hello</h1><p>Some <b>bold</b> text</p></div></main>",
+        )
+
+    def test_render_bytes_basepath(self):
+        builder = Builder(TEMPLATE, "/site/")
+        page = builder.render_bytes("# Hi\n\n[home](/)")
+        self.assertIn(b'href="/site/index.css"', page)
+        self.assertIn(b'<a href="/site/">home</a>', page)
+
+    def test_accepts_compiled_template(self):
+        template = Template("<html>\n  {{ Content }}\n</html>", minify=True)
+        self.assertEqual(
+            Builder(template).render("# Hi"), "<html><div><h1>Hi</h1></div></html>"
+        )
+
+    def test_build_mapping(self):
+        pages = Builder(TEMPLATE).build(
+            {"index.md": "# Home", "blog/tom/index.md": "# Tom"}
+        )
+        self.assertEqual(sorted(pages), ["blog/tom/index.html", "index.html"])
+        self.assertIn("<h1>Tom</h1>", pages["blog/tom/index.html"])
+
+    def test_build_reports_page(self):
+        with self.assertRaisesRegex(ValueError, "^draft.md: "):
+            Builder(TEMPLATE).build({"draft.md": "no title"})
+
+    def test_output_path(self):
+        self.assertEqual(output_path("blog/post.markdown"), "blog/post.html")
+
+    def test_read_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "blog"))
+            for path, text in (("index.md", "# Home"), ("blog/a.md", "# A")):
+                with open(os.path.join(tmp, path), "w") as f:
+                    f.write(text)
+            self.assertEqual(
+                read_pages(tmp), {"blog/a.md": "# A", "index.md": "# Home"}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from buildplan import iter_tree, make_plan, scan_tree
+
+
+class TestBuildPlan(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        for path, text in (
+            ("content/index.md", "# Home"),
+            ("content/blog/b/index.md", "# B"),
+            ("content/blog/a/index.md", "# A"),
+            ("content/about.md", "# About"),
+            ("static/index.css", "body {}"),
+            ("static/images/logo.png", "png"),
+        ):
+            path = os.path.join(self.tmp.name, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_sorted_depth_first(self):
+        entries = scan_tree(self.content, self.public, ".html")
+        self.assertEqual(
+            [os.path.relpath(entry.source, self.content) for entry in entries],
+            ["about.md", "blog/a/index.md", "blog/b/index.md", "index.md"],
+        )
+        self.assertEqual(
+            entries[1].dest, Path(self.public, "blog", "a", "index.html")
+        )
+
+    def test_scan_records_stat(self):
+        entry = scan_tree(self.static, self.public)[1]
+        stat = os.stat(entry.source)
+        self.assertEqual(entry.dest, os.path.join(self.public, "index.css"))
+        self.assertEqual((entry.size, entry.mtime_ns), (7, stat.st_mtime_ns))
+
+    def test_iter_tree_is_lazy(self):
+        entries = iter_tree(self.content, self.public, ".html")
+        self.assertEqual(next(entries).source, os.path.join(self.content, "about.md"))
+        self.assertEqual(len(list(entries)), 3)
+
+    def test_scan_missing_directory(self):
+        self.assertEqual(scan_tree(os.path.join(self.tmp.name, "nope"), "out"), [])
+
+    def test_make_plan_save(self):
+        plan = make_plan(self.content, self.static, self.public)
+        self.assertEqual(repr(plan), "BuildPlan(pages: 4, assets: 2)")
+        path = os.path.join(self.tmp.name, "plan.json")
+        plan.save(path)
+        with open(path) as f:
+            data = json.load(f)
+        self.assertEqual(len(data["pages"]), 4)
+        self.assertEqual(data["assets"][0]["size"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from check import check_site
+
+
+class TestCheckSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home\n\n[Blog](/blog/tom) [CSS](/index.css)")
+        self.write("content/blog/tom/index.md", "# Tom\n\n[Back](/)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        path = os.path.join(self.tmp.name, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_clean_site(self):
+        self.assertEqual(check_site(self.content, self.static, self.template), ([], 2))
+
+    def test_reports_problems(self):
+        self.write("template.html", "<title>{{ Title }}</title>")
+        self.write("content/draft.md", "no title")
+        self.write("content/blog/tom/index.md", "# Tom\n\n![img](/images/tom.png)")
+        problems, pages = check_site(self.content, self.static, self.template)
+        tom = os.path.join(self.content, "blog", "tom", "index.md")
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            problems,
+            [
+                (self.template, "no {{ Content }} placeholder"),
+                (tom, "broken link: /images/tom.png"),
+                (os.path.join(self.content, "draft.md"), "no title found"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from compress import compress_file, compress_outputs, remove_stale_siblings
+from output import WriteStats
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.html = os.path.join(self.tmp.name, "index.html")
+        with open(self.html, "w") as f:
+            f.write("<h1>Tolkien Fan Club</h1>" * 20)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compress_file(self):
+        siblings, written = compress_file(self.html)
+        self.assertEqual(siblings, [f"{self.html}.gz"])
+        self.assertEqual(written, siblings)
+        with gzip.open(f"{self.html}.gz", "rb") as f, open(self.html, "rb") as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_skips_up_to_date_sibling(self):
+        compress_file(self.html)
+        self.assertEqual(compress_file(self.html)[1], [])
+        with open(self.html, "a") as f:
+            f.write("<p>more</p>")
+        os.utime(self.html, ns=(0, 1))
+        self.assertEqual(compress_file(self.html)[1], [f"{self.html}.gz"])
+
+    def test_compress_outputs_records_siblings(self):
+        image = os.path.join(self.tmp.name, "logo.png")
+        with open(image, "wb") as f:
+            f.write(b"\\x89PNG")
+        stats = WriteStats()
+        with redirect_stdout(io.StringIO()):
+            compress_outputs([self.html, image], 2, ("gz",), stats)
+            compress_outputs([self.html, image], 2, ("gz",), stats)
+        self.assertEqual((stats.written, stats.skipped), (1, 1))
+        self.assertEqual(stats.outputs, {os.path.abspath(f"{self.html}.gz")})
+        self.assertFalse(os.path.exists(f"{image}.gz"))
+
+    def test_remove_stale_siblings(self):
+        compress_file(self.html)
+        self.assertEqual(remove_stale_siblings([self.html]), [])
+        # rewritten by a build without compression
+        with open(self.html, "w") as f:
+            f.write("<h1>Changed</h1>")
+        os.utime(self.html, ns=(0, 1))
+        self.assertEqual(remove_stale_siblings([self.html]), [f"{self.html}.gz"])
+        self.assertFalse(os.path.exists(f"{self.html}.gz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
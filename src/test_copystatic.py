@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from copystatic import (
+    LINK_MODES,
+    copy_files_incremental,
+    copy_files_parallel,
+    sync_file,
+)
+from manifest import new_manifest
+from output import WriteStats
+
+
+class TestCopyStatic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.static, "images"))
+        for name, data in (("index.css", b"body {}"), ("images/a.png", b"\x89PNG")):
+            with open(os.path.join(self.static, name), "wb") as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def copy(self, link_mode="copy"):
+        stats = WriteStats()
+        with redirect_stdout(io.StringIO()):
+            copy_files_parallel(self.static, self.public, 4, link_mode, stats)
+        return stats
+
+    def test_copies_every_mode(self):
+        for link_mode in LINK_MODES:
+            stats = self.copy(link_mode)
+            with open(os.path.join(self.public, "images", "a.png"), "rb") as f:
+                self.assertEqual(f.read(), b"\x89PNG")
+            self.assertEqual(stats.written + stats.skipped, 2)
+
+    def test_skips_unchanged(self):
+        self.assertEqual(self.copy().written, 2)
+        stats = self.copy()
+        self.assertEqual((stats.written, stats.skipped), (0, 2))
+
+    def test_recopies_changed(self):
+        self.copy()
+        source = os.path.join(self.static, "index.css")
+        with open(source, "wb") as f:
+            f.write(b"body { margin: 0 }")
+        dest = os.path.join(self.public, "index.css")
+        self.assertTrue(sync_file(source, dest))
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(), b"body { margin: 0 }")
+
+    def test_hardlink(self):
+        self.copy("hardlink")
+        source = os.path.join(self.static, "index.css")
+        dest = os.path.join(self.public, "index.css")
+        self.assertTrue(os.path.samefile(source, dest))
+
+    def test_incremental_uses_link_mode(self):
+        manifest = new_manifest()
+        stats = WriteStats()
+        with redirect_stdout(io.StringIO()):
+            copy_files_incremental(
+                self.static, self.public, manifest, stats, jobs=2, link_mode="hardlink"
+            )
+        self.assertEqual(stats.written, 2)
+        source = os.path.join(self.static, "index.css")
+        dest = os.path.join(self.public, "index.css")
+        self.assertTrue(os.path.samefile(source, dest))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.copy("symlink")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from corpus import SHAPES, generate_corpus
+from gencontent import collect_pages, extract_title
+from markdown_blocks import markdown_to_html_node
+
+
+class TestCorpus(unittest.TestCase):
+    def test_shapes_render(self):
+        for shape in SHAPES:
+            with tempfile.TemporaryDirectory() as root:
+                total_bytes = generate_corpus(root, shape, 3)
+                pages = collect_pages(root, "")
+                self.assertEqual(len(pages), 3)
+                self.assertGreater(total_bytes, 0)
+                for from_path, _ in pages:
+                    with open(from_path) as f:
+                        markdown = f.read()
+                    extract_title(markdown)
+                    markdown_to_html_node(markdown).to_html()
+
+    def test_deterministic(self):
+        with tempfile.TemporaryDirectory() as first:
+            with tempfile.TemporaryDirectory() as second:
+                generate_corpus(first, "link-dense", 2, seed=7)
+                generate_corpus(second, "link-dense", 2, seed=7)
+                path = os.path.join("section1", "page1", "index.md")
+                with open(os.path.join(first, path)) as a:
+                    with open(os.path.join(second, path)) as b:
+                        self.assertEqual(a.read(), b.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from depgraph import find_references, output_urls, rebuild_reasons
+
+
+class TestFindReferences(unittest.TestCase):
+    def test_local_references(self):
+        html = (
+            '<a href="/blog/tom">t</a><img src="/images/a.png" alt="a"></img>'
+            '<a href="https://boot.dev">b</a><a href="//cdn.dev/x">c</a>'
+            '<a href="/contact#form">d</a>'
+        )
+        self.assertEqual(
+            find_references(html), ["/blog/tom", "/images/a.png", "/contact"]
+        )
+
+
+class TestOutputUrls(unittest.TestCase):
+    def test_index(self):
+        self.assertEqual(
+            output_urls(os.path.join("docs", "blog", "tom", "index.html"), "docs"),
+            ["/blog/tom/index.html", "/blog/tom/", "/blog/tom"],
+        )
+
+    def test_root_index(self):
+        self.assertEqual(
+            output_urls(os.path.join("docs", "index.html"), "docs"),
+            ["/index.html", "/"],
+        )
+
+
+class TestRebuildReasons(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.public = self.tmp.name
+        self.index = os.path.join(self.public, "index.html")
+        self.post = os.path.join(self.public, "post", "index.html")
+        for path in (self.index, self.post):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        self.pages = {
+            "index.md": {
+                "hash": "1",
+                "dest": self.index,
+                "template": "t.html",
+                "refs": ["/post", "/images/a.png"],
+            },
+            "post.md": {"hash": "2", "dest": self.post, "template": "t.html"},
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unchanged(self):
+        self.assertEqual(rebuild_reasons(self.pages, self.pages, self.public), {})
+
+    def test_source_and_new(self):
+        pages = dict(self.pages)
+        pages["post.md"] = dict(pages["post.md"], hash="3")
+        pages["new.md"] = {"hash": "4", "dest": "x.html", "template": "t.html"}
+        self.assertEqual(
+            rebuild_reasons(self.pages, pages, self.public),
+            {"post.md": ["source changed"], "new.md": ["new page"]},
+        )
+
+    def test_template_changed(self):
+        reasons = rebuild_reasons(
+            self.pages, self.pages, self.public, template_changed=True
+        )
+        self.assertEqual(reasons["post.md"], ["template changed: t.html"])
+
+    def test_asset_changed(self):
+        asset = os.path.join(self.public, "images", "a.png")
+        reasons = rebuild_reasons(
+            self.pages, self.pages, self.public, changed_assets=[asset]
+        )
+        self.assertEqual(reasons, {"index.md": ["asset changed: /images/a.png"]})
+
+    def test_linked_page_removed(self):
+        pages = {"index.md": self.pages["index.md"]}
+        reasons = rebuild_reasons(self.pages, pages, self.public)
+        self.assertEqual(reasons, {"index.md": ["linked page removed: /post"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
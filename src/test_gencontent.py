@@ -1,6 +1,15 @@
+import io
+import os
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 
-from gencontent import extract_title
+from gencontent import (
+    collect_pages,
+    extract_title,
+    generate_pages,
+    generate_pages_recursive,
+)
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -46,5 +55,66 @@ no title
             pass
 
 
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        with open(self.template, "w") as f:
+            f.write('<title>{{ Title }}</title><a href="/">home</a>{{ Content }}')
+        for i in range(6):
+            page_dir = os.path.join(self.content, f"page{i}")
+            os.makedirs(page_dir)
+            with open(os.path.join(page_dir, "index.md"), "w") as f:
+                f.write(f"# Page {i}\n\nSee [home](/) and **page** {i}.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, dest, jobs, stream=False):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            generate_pages_recursive(
+                self.content, self.template, dest, "/b/", jobs, stream
+            )
+        pages = {}
+        for i in range(6):
+            with open(os.path.join(dest, f"page{i}", "index.html")) as f:
+                pages[i] = f.read()
+        return output.getvalue(), pages
+
+    def test_parallel_matches_serial(self):
+        serial_log, serial_pages = self.build(os.path.join(self.root, "serial"), 1)
+        parallel_log, parallel_pages = self.build(
+            os.path.join(self.root, "parallel"), 3
+        )
+        self.assertEqual(serial_pages, parallel_pages)
+        self.assertEqual(
+            serial_log.replace("serial", "out"), parallel_log.replace("parallel", "out")
+        )
+        self.assertIn('<a href="/b/">home</a>', serial_pages[0])
+
+    def test_bounded_window_matches_serial(self):
+        serial_log, serial_pages = self.build(os.path.join(self.root, "serial"), 1)
+        dest = os.path.join(self.root, "bounded")
+        pages = iter(collect_pages(self.content, dest))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            generate_pages(pages, self.template, "/b/", 2, True, window=2)
+        for i in range(6):
+            with open(os.path.join(dest, f"page{i}", "index.html")) as f:
+                self.assertEqual(f.read(), serial_pages[i])
+        self.assertEqual(
+            serial_log.replace("serial", "out"),
+            output.getvalue().replace("bounded", "out"),
+        )
+
+    def test_streaming_matches_regular(self):
+        _, pages = self.build(os.path.join(self.root, "regular"), 1)
+        _, streamed_pages = self.build(os.path.join(self.root, "streamed"), 1, True)
+        self.assertEqual(pages, streamed_pages)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
+import io
 import unittest
-from htmlnode import LeafNode, ParentNode, HTMLNode
+from htmlnode import LeafNode, ParentNode, HTMLNode, write_html
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -49,6 +50,10 @@ class TestHTMLNode(unittest.TestCase):
             "HTMLNode(p, What a strange world, children: None, {'class': 'primary'})",
         )
 
+    def test_slots(self):
+        for node in (LeafNode("p", "x"), ParentNode("div", []), HTMLNode("p")):
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
         self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
@@ -108,6 +113,31 @@ class TestHTMLNode(unittest.TestCase):
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
 
+    def test_to_html_deep_nesting(self):
+        node = LeafNode("b", "deep")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 5000 + "<b>deep</b>"))
+        self.assertTrue(html.endswith("</span>" * 5000))
+
+    def test_to_html_nested_no_children(self):
+        node = ParentNode("div", [ParentNode("p", None)])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+    def test_write_html(self):
+        node = ParentNode(
+            "ul",
+            [ParentNode("li", [LeafNode("a", "x", {"href": "/x"})]), LeafNode("li", "y")],
+        )
+        out = io.StringIO()
+        write_html(node, out)
+        self.assertEqual(out.getvalue(), node.to_html())
+        self.assertEqual(
+            out.getvalue(), '<ul><li><a href="/x">x</a></li><li>y</li></ul>'
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
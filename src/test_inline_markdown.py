@@ -6,6 +6,10 @@ from inline_markdown import (
     text_to_textnodes,
     extract_markdown_links,
     extract_markdown_images,
+    memo_parse,
+    memo_stats,
+    memo_text_to_textnodes,
+    MEMO_MAX_TEXT_LENGTH,
 )
 
 from textnode import TextNode, TextType
@@ -191,6 +195,70 @@ class TestInlineMarkdown(unittest.TestCase):
             nodes,
         )
 
+    def test_text_to_textnodes_plain(self):
+        self.assertListEqual(
+            [TextNode("just some plain text", TextType.TEXT)],
+            text_to_textnodes("just some plain text"),
+        )
+
+    def test_text_to_textnodes_empty(self):
+        self.assertListEqual([], text_to_textnodes(""))
+
+    def test_text_to_textnodes_unclosed(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This is **not closed")
+
+    def test_text_to_textnodes_literal_brackets(self):
+        self.assertListEqual(
+            [
+                TextNode("a [b] and ![c] then ", TextType.TEXT),
+                TextNode("d", TextType.LINK, "e"),
+            ],
+            text_to_textnodes("a [b] and ![c] then [d](e)"),
+        )
+
+    def test_text_to_textnodes_matches_chained_splits(self):
+        text = " ".join(
+            f"word **b{i}** [l{i}](https://x.dev/{i}) `c{i}` ![i{i}](/{i}.png) _t{i}_"
+            for i in range(200)
+        )
+        nodes = [TextNode(text, TextType.TEXT)]
+        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+        nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        nodes = split_nodes_image(nodes)
+        nodes = split_nodes_link(nodes)
+        self.assertListEqual(nodes, text_to_textnodes(text))
+
+    def test_memo_shares_result(self):
+        memo_parse.cache_clear()
+        first = memo_text_to_textnodes("a **nav** [link](/x)")
+        second = memo_text_to_textnodes("a **nav** [link](/x)")
+        self.assertIs(first, second)
+        self.assertIsInstance(first, tuple)
+        self.assertListEqual(list(first), text_to_textnodes("a **nav** [link](/x)"))
+        stats = memo_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_memo_skips_long_text(self):
+        memo_parse.cache_clear()
+        text = "x" * (MEMO_MAX_TEXT_LENGTH + 1)
+        self.assertEqual(memo_text_to_textnodes(text), (TextNode(text, TextType.TEXT),))
+        self.assertEqual(memo_stats()["entries"], 0)
+
+    def test_delim_no_delimiter_passthrough(self):
+        node = TextNode("plain text only", TextType.TEXT)
+        new_nodes = split_nodes_delimiter([node], "**", TextType.BOLD)
+        self.assertEqual(len(new_nodes), 1)
+        self.assertIs(new_nodes[0], node)
+
+    def test_text_to_textnodes_single_star(self):
+        self.assertListEqual(
+            [TextNode("2 * 3 is six", TextType.TEXT)],
+            text_to_textnodes("2 * 3 is six"),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
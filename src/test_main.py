@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from main import parse_args
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestParseArgs(unittest.TestCase):
+    def test_bare_arguments_build(self):
+        args = parse_args(["/ssg/", "--jobs", "2"])
+        self.assertEqual(
+            (args.command, args.basepath, args.jobs), ("build", "/ssg/", 2)
+        )
+        self.assertEqual(parse_args([]).command, "build")
+
+    def test_commands(self):
+        self.assertEqual(parse_args(["build"]).basepath, "/")
+        args = parse_args(["render-one", "page.md", "--basepath", "/b/"])
+        self.assertEqual(
+            (args.command, args.source, args.basepath), ("render-one", "page.md", "/b/")
+        )
+        self.assertEqual(parse_args(["check"]).command, "check")
+
+    def test_render_one_stdin_and_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w") as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            main = os.path.join(SRC_DIR, "main.py")
+            command = [sys.executable, main, "render-one", "--template", template]
+            result = subprocess.run(
+                [*command, "--stream"], input="# Hi", capture_output=True, text=True
+            )
+            self.assertEqual(result.stdout, "<title>Hi</title><div><h1>Hi</h1></div>")
+
+            source = os.path.join(tmp, "page.md")
+            with open(source, "w") as f:
+                f.write("# Page")
+            dest = os.path.join(tmp, "out", "page.html")
+            subprocess.run([*command, source, "-o", dest], check=True)
+            with open(dest) as f:
+                self.assertEqual(f.read(), "<title>Page</title><div><h1>Page</h1></div>")
+
+            result = subprocess.run(
+                command, input="no title", capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 1)
+            self.assertEqual(result.stderr.strip(), "-: no title found")
+
+            missing = os.path.join(tmp, "missing.md")
+            result = subprocess.run([*command, missing], capture_output=True, text=True)
+            self.assertEqual(result.returncode, 1)
+            self.assertEqual(
+                result.stderr.strip(), f"{missing}: No such file or directory"
+            )
+
+    def test_render_one_skips_build_imports(self):
+        code = (
+            "import sys; from main import parse_args; "
+            "parse_args(['render-one', 'page.md']); import render; "
+            "print(sorted({'copystatic', 'gencontent', 'sqlite3'} & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from gencontent import generate_pages_incremental
+from manifest import load_manifest, new_manifest, remove_output, save_manifest
+
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        write(self.template, TEMPLATE)
+        write(os.path.join(self.content, "index.md"), "# Home")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, manifest):
+        generate_pages_incremental(
+            self.content, self.template, self.public, "/", manifest
+        )
+
+    def test_roundtrip(self):
+        path = os.path.join(self.root, "manifest.json")
+        manifest = new_manifest()
+        manifest["pages"]["a.md"] = {"hash": "abc", "dest": "a.html"}
+        save_manifest(path, manifest)
+        self.assertEqual(load_manifest(path), manifest)
+
+    def test_missing_manifest(self):
+        path = os.path.join(self.root, "missing.json")
+        self.assertEqual(load_manifest(path), new_manifest())
+
+    def test_skips_unchanged(self):
+        manifest = new_manifest()
+        self.build(manifest)
+        post = os.path.join(self.public, "blog", "post.html")
+        os.utime(post, (0, 0))
+        self.build(manifest)
+        self.assertEqual(os.path.getmtime(post), 0)
+
+    def test_rebuilds_changed(self):
+        manifest = new_manifest()
+        self.build(manifest)
+        write(os.path.join(self.content, "blog", "post.md"), "# Changed")
+        self.build(manifest)
+        with open(os.path.join(self.public, "blog", "post.html")) as f:
+            self.assertIn("<h1>Changed</h1>", f.read())
+
+    def test_rehashes_only_moved_files(self):
+        manifest = new_manifest()
+        self.build(manifest)
+        post = os.path.join(self.content, "blog", "post.md")
+        real_hash = manifest["pages"][post]["hash"]
+        # same size and mtime: the recorded hash is trusted, the file not read
+        manifest["pages"][post]["hash"] = "recorded"
+        self.build(manifest)
+        self.assertEqual(manifest["pages"][post]["hash"], "recorded")
+        stat = os.stat(post)
+        os.utime(post, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.build(manifest)
+        self.assertEqual(manifest["pages"][post]["hash"], real_hash)
+
+    def test_template_change_rebuilds_all(self):
+        manifest = new_manifest()
+        self.build(manifest)
+        write(self.template, "<main>{{ Content }}</main>")
+        self.build(manifest)
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertEqual(f.read(), "<main><div><h1>Home</h1></div></main>")
+
+    def test_template_references_are_dependencies(self):
+        write(self.template, '<link href="/index.css" />{{ Content }}')
+        for stream in (False, True):
+            manifest = new_manifest()
+            generate_pages_incremental(
+                self.content, self.template, self.public, "/", manifest, stream=stream
+            )
+            index = os.path.join(self.content, "index.md")
+            self.assertEqual(manifest["pages"][index]["refs"], ["/index.css"])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            generate_pages_incremental(
+                self.content,
+                self.template,
+                self.public,
+                "/",
+                manifest,
+                changed_assets=[os.path.join(self.public, "index.css")],
+                explain=True,
+            )
+        self.assertEqual(output.getvalue().count("asset changed: /index.css"), 2)
+
+    def test_removes_deleted(self):
+        manifest = new_manifest()
+        self.build(manifest)
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.build(manifest)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_remove_output_keeps_root(self):
+        path = os.path.join(self.public, "only.html")
+        write(path, "")
+        remove_output(path, self.public)
+        self.assertTrue(os.path.isdir(self.public))
+
+    def test_remove_output_siblings(self):
+        path = os.path.join(self.public, "blog", "index.html")
+        write(path, "")
+        write(f"{path}.gz", "")
+        remove_output(path, self.public)
+        self.assertFalse(os.path.exists(f"{path}.gz"))
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import io
 import unittest
 from markdown_blocks import (
+    iter_blocks,
+    write_markdown_html,
     markdown_to_html_node,
     markdown_to_blocks,
     block_to_block_type,
@@ -163,6 +166,42 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
         )
 
+    def test_iter_blocks_matches_markdown_to_blocks(self):
+        md = """
+# heading
+
+This is **bolded** paragraph
+on two lines
+
+
+
+- a list
+- of items
+
+   
+
+```
+code
+```
+"""
+        for text in (md, "# T\n\npara one\n\n   \n\npara two\n", "a\n\n\n\n\nb"):
+            lines = io.StringIO(text)
+            self.assertEqual(list(iter_blocks(lines)), markdown_to_blocks(text))
+
+    def test_write_markdown_html(self):
+        md = """
+# heading
+
+> a _quote_
+
+1. one
+2. two
+"""
+        parts = []
+        write_markdown_html(io.StringIO(md), parts.append)
+        self.assertEqual("".join(parts), markdown_to_html_node(md).to_html())
+        self.assertEqual(len(parts), 5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from minify import Minifier, minify_html
+from template import Template
+
+
+class TestMinify(unittest.TestCase):
+    def test_drops_whitespace_around_blocks(self):
+        html = "<html>\n  <body>\n    <p>Hello   there\n  world</p>\n  </body>\n</html>\n"
+        self.assertEqual(
+            minify_html(html), "<html><body><p>Hello there world</p></body></html>"
+        )
+
+    def test_keeps_space_between_inline_elements(self):
+        self.assertEqual(
+            minify_html("<p><b>bold</b>  \n <i>italic</i> text</p>"),
+            "<p><b>bold</b> <i>italic</i> text</p>",
+        )
+
+    def test_keeps_non_breaking_spaces(self):
+        self.assertEqual(minify_html("<p>a\xa0\xa0b</p>"), "<p>a\xa0\xa0b</p>")
+        self.assertEqual(
+            minify_html("<p>\u2003a \t b\xa0</p>"), "<p>\u2003a b\xa0</p>"
+        )
+
+    def test_leaves_pre_untouched(self):
+        html = "<div>\n<pre><code>def f():\n    return  1\n</code></pre>\n</div>"
+        self.assertEqual(
+            minify_html(html),
+            "<div><pre><code>def f():\n    return  1\n</code></pre></div>",
+        )
+
+    def test_tag_split_across_chunks(self):
+        parts = []
+        minifier = Minifier(parts.append)
+        for chunk in ("<p>a  b</p>\n  <a hr", 'ef="/">x</a> <pre>  y', "  </pre>"):
+            minifier.write(chunk)
+        minifier.close()
+        self.assertEqual("".join(parts), '<p>a b</p><a href="/">x</a><pre>  y  </pre>')
+
+    def test_text_with_angle_bracket(self):
+        self.assertEqual(minify_html("<a>< Back  Home</a>"), "<a>< Back Home</a>")
+
+    def test_template_render_and_stream_match(self):
+        template = Template(
+            "<html>\n  <title>{{ Title }}</title>\n  {{ Content }}\n</html>",
+            minify=True,
+        )
+        content = "<div><p>x\n y</p></div>"
+        parts = []
+        template.stream(parts.append, "Home", lambda write: write(content))
+        self.assertEqual(
+            template.render("Home", content),
+            "<html><title>Home</title><div><p>x y</p></div></html>",
+        )
+        self.assertEqual("".join(parts), template.render("Home", content))
+
+
+if __name__ == "__main__":
+    unittest.main()
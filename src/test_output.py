@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from output import (
+    WriteStats,
+    copy_if_changed,
+    prune_outputs,
+    replace_if_changed,
+    write_if_changed,
+)
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_write_new_file(self):
+        path = os.path.join(self.root, "a", "b.html")
+        self.assertTrue(write_if_changed(path, "<p>hi</p>"))
+        self.assertEqual(self.read(path), "<p>hi</p>")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["b.html"])
+
+    def test_skip_identical(self):
+        path = os.path.join(self.root, "b.html")
+        write_if_changed(path, "<p>hi</p>")
+        os.utime(path, (0, 0))
+        self.assertFalse(write_if_changed(path, "<p>hi</p>"))
+        self.assertEqual(os.path.getmtime(path), 0)
+
+    def test_rewrite_changed(self):
+        path = os.path.join(self.root, "b.html")
+        write_if_changed(path, "<p>hi</p>")
+        self.assertTrue(write_if_changed(path, "<p>ho</p>"))
+        self.assertEqual(self.read(path), "<p>ho</p>")
+
+    def test_replace_if_changed(self):
+        path = os.path.join(self.root, "b.html")
+        tmp_path = os.path.join(self.root, "b.tmp")
+        write_if_changed(path, "same")
+        write_if_changed(tmp_path, "same")
+        self.assertFalse(replace_if_changed(tmp_path, path))
+        self.assertFalse(os.path.exists(tmp_path))
+
+    def test_copy_if_changed(self):
+        source = os.path.join(self.root, "src.css")
+        dest = os.path.join(self.root, "out", "dest.css")
+        write_if_changed(source, "body {}")
+        self.assertTrue(copy_if_changed(source, dest))
+        self.assertFalse(copy_if_changed(source, dest))
+        self.assertEqual(self.read(dest), "body {}")
+
+    def test_prune_outputs(self):
+        keep = os.path.join(self.root, "keep.html")
+        stale = os.path.join(self.root, "old", "stale.html")
+        write_if_changed(keep, "")
+        write_if_changed(stale, "")
+        stats = WriteStats()
+        stats.record(keep, False)
+        self.assertEqual(prune_outputs(self.root, stats.outputs), [stale])
+        self.assertTrue(os.path.exists(keep))
+        self.assertFalse(os.path.exists(os.path.dirname(stale)))
+
+    def test_prune_outputs_deep_tree(self):
+        # deeper than the recursion limit, so a recursive walk would fail
+        path = self.root
+        for _ in range(sys.getrecursionlimit() + 50):
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+        stale = os.path.join(path, "stale.html")
+        open(stale, "w").close()
+        self.assertEqual(prune_outputs(self.root, set()), [stale])
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_stats(self):
+        stats = WriteStats()
+        stats.record("a", True)
+        stats.record("b", False)
+        stats.record("c", False)
+        self.assertEqual((stats.written, stats.skipped), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import bounded_map, peak_rss
+
+
+class TestPipeline(unittest.TestCase):
+    def test_bounded_map_in_order(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(bounded_map(executor, lambda x: x * x, range(20), 3))
+        self.assertEqual(results, [(x, x * x) for x in range(20)])
+
+    def test_bounded_map_window(self):
+        pulled = []
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def items():
+            for i in range(10):
+                pulled.append(i)
+                yield i
+
+        def work(item):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            with lock:
+                in_flight[0] -= 1
+            return item
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = bounded_map(executor, work, items(), 2)
+            self.assertEqual(next(results), (0, 0))
+            # the first result is yielded once a third item is needed
+            self.assertEqual(pulled, [0, 1, 2])
+            self.assertEqual(len(list(results)), 9)
+        self.assertLessEqual(in_flight[1], 2)
+
+    def test_peak_rss(self):
+        own, children = peak_rss()
+        self.assertGreater(own, 1 << 20)
+        self.assertGreaterEqual(children, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
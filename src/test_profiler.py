@@ -0,0 +1,69 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import gencontent
+import markdown_blocks
+from gencontent import generate_pages_recursive
+from profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        os.makedirs(self.content)
+        with open(self.template, "w") as f:
+            f.write("{{ Title }}{{ Content }}")
+        for name in ("a", "b"):
+            with open(os.path.join(self.content, f"{name}.md"), "w") as f:
+                f.write(f"# {name}\n\nsome _text_\n\n- a\n- list")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self):
+        public = os.path.join(self.root, "public")
+        with redirect_stdout(io.StringIO()):
+            generate_pages_recursive(self.content, self.template, public, "/")
+
+    def test_records_stages_and_pages(self):
+        profiler = Profiler(trace=True)
+        profiler.install()
+        try:
+            self.build()
+        finally:
+            profiler.uninstall()
+        self.assertEqual(profiler.stages["page"][0], 2)
+        self.assertEqual(profiler.stages["read"][0], 2)
+        self.assertEqual(profiler.stages["block_to_html_node"][0], 6)
+        self.assertEqual(profiler.stages["text_to_textnodes"][0], 8)
+        self.assertEqual(len(profiler.pages), 2)
+
+        trace_path = os.path.join(self.root, "trace.json")
+        profiler.dump_trace(trace_path)
+        with open(trace_path) as f:
+            events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), len(profiler.events))
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+
+    def test_uninstall_restores(self):
+        render_page = gencontent.render_page
+        text_to_textnodes = markdown_blocks.memo_text_to_textnodes
+        profiler = Profiler()
+        profiler.install()
+        self.assertIsNot(gencontent.render_page, render_page)
+        profiler.uninstall()
+        self.assertIs(gencontent.render_page, render_page)
+        self.assertIs(markdown_blocks.memo_text_to_textnodes, text_to_textnodes)
+        self.build()
+        self.assertEqual(profiler.stages["page"][0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import io
+import unittest
+
+from render import peek_title, render_markdown, stream_markdown
+from template import Template
+
+
+class TestRender(unittest.TestCase):
+    def test_peek_title_replays_lines(self):
+        lines = iter(["intro\n", "# Title\n", "\n", "body\n"])
+        title, replay = peek_title(lines)
+        self.assertEqual(title, "Title")
+        self.assertEqual(list(replay), ["intro\n", "# Title\n", "\n", "body\n"])
+
+    def test_peek_title_missing(self):
+        with self.assertRaises(ValueError):
+            peek_title(["no title\n"])
+
+    def test_stream_matches_render(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}", "/b/")
+        markdown = "Some [link](/a)\n\n# Title\n\n- one\n- two\n"
+        parts = []
+        references = []
+        stream_markdown(io.StringIO(markdown), template, parts.append, None, references)
+        self.assertEqual("".join(parts), render_markdown(markdown, template))
+        self.assertEqual(references, ["/a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import rendercache
+from markdown_blocks import markdown_to_html_node
+from rendercache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_put(self):
+        cache = RenderCache(self.path)
+        self.assertIsNone(cache.get("block"))
+        cache.put("block", "<p>block</p>")
+        self.assertEqual(cache.get("block"), "<p>block</p>")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_persists_across_builds(self):
+        cache = RenderCache(self.path)
+        cache.put("block", "<p>block</p>")
+        cache.close()
+        cache = RenderCache(self.path)
+        self.assertEqual(cache.get("block"), "<p>block</p>")
+        cache.close()
+
+    def test_flushes_in_batches(self):
+        cache = RenderCache(self.path, flush_every=3)
+        for i in range(7):
+            cache.put(f"block {i}", f"<p>block {i}</p>")
+            self.assertLess(len(cache.pending), 3)
+        self.assertEqual(len(cache), 6)
+        for i in range(7):
+            cache.get(f"block {i}")
+            self.assertLess(len(cache.touched), 3)
+        cache.close()
+        cache = RenderCache(self.path)
+        self.assertEqual(len(cache), 7)
+        cache.close()
+
+    def test_parser_version_in_key(self):
+        cache = RenderCache(self.path)
+        key = cache.key("block")
+        original = rendercache.PARSER_VERSION
+        rendercache.PARSER_VERSION = "test"
+        try:
+            self.assertNotEqual(cache.key("block"), key)
+        finally:
+            rendercache.PARSER_VERSION = original
+        cache.close()
+
+    def test_evicts_least_recently_used(self):
+        cache = RenderCache(self.path, max_entries=2)
+        cache.put("a", "A")
+        cache.flush()
+        cache.put("b", "B")
+        cache.flush()
+        cache.get("a")
+        cache.flush()
+        cache.put("c", "C")
+        cache.close()
+        cache = RenderCache(self.path, max_entries=2)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        cache.close()
+
+    def test_clear(self):
+        cache = RenderCache(self.path)
+        cache.put("a", "A")
+        cache.flush()
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+        cache.close()
+
+    def test_markdown_to_html_node(self):
+        md = "# title\n\nsome **bold** text\n\n- a\n- b\n\nsome **bold** text"
+        cache = RenderCache(self.path)
+        first = markdown_to_html_node(md, cache).to_html()
+        second = markdown_to_html_node(md, cache).to_html()
+        self.assertEqual(first, markdown_to_html_node(md).to_html())
+        self.assertEqual(second, first)
+        self.assertEqual((cache.hits, cache.misses), (5, 3))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from renderserver import RenderServer
+from template import Template
+
+
+class TestRenderServer(unittest.TestCase):
+    def serve(self, lines, jobs=1):
+        server = RenderServer(Template("<main>{{ Content }}</main>"), jobs)
+        infile = io.BytesIO("".join(f"{line}\n" for line in lines).encode("utf-8"))
+        outfile = io.BytesIO()
+        try:
+            server.serve_stream(infile, outfile)
+        finally:
+            server.close()
+        responses = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        return {response["id"]: response for response in responses}
+
+    def test_render(self):
+        responses = self.serve([json.dumps({"id": 1, "markdown": "# Hi"}), ""])
+        self.assertEqual(responses[1]["html"], "<main><div><h1>Hi</h1></div></main>")
+        self.assertGreaterEqual(responses[1]["ms"], responses[1]["render_ms"])
+
+    def test_errors(self):
+        responses = self.serve(
+            [json.dumps({"id": "a", "markdown": "no title"}), "not json"]
+        )
+        self.assertEqual(responses["a"]["error"], "no title found")
+        self.assertIn("invalid request", responses[None]["error"])
+
+    def test_markdown_must_be_a_string(self):
+        for jobs in (1, 2):
+            responses = self.serve(
+                [
+                    json.dumps({"id": 1, "markdown": None}),
+                    json.dumps({"id": 2, "markdown": 42}),
+                    json.dumps({"id": 3, "markdown": "# Still serving"}),
+                ],
+                jobs,
+            )
+            self.assertIn("invalid request", responses[1]["error"])
+            self.assertIn("invalid request", responses[2]["error"])
+            self.assertIn("<h1>Still serving</h1>", responses[3]["html"])
+
+    def test_unexpected_errors_get_a_response(self):
+        server = RenderServer(Template("<main>{{ Content }}</main>"))
+        server.builder = None
+        messages = []
+        server.handle(json.dumps({"id": 1, "markdown": "# Hi"}), messages.append)
+        self.assertEqual(len(messages), 1)
+        self.assertIn("render failed: AttributeError", messages[0]["error"])
+
+        # the same failure inside a pool worker is answered from the callback;
+        # render_worker has no builder in this process
+        server.executor = ThreadPoolExecutor(max_workers=1)
+        request = json.dumps({"id": 2, "markdown": "# Hi"})
+        future = server.handle(request, messages.append)
+        wait([future])
+        server.close()
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[1]["id"], 2)
+        self.assertIn("render failed: AttributeError", messages[1]["error"])
+
+    def test_worker_pool(self):
+        lines = [json.dumps({"id": i, "markdown": f"# Page {i}"}) for i in range(8)]
+        responses = self.serve(lines, jobs=2)
+        self.assertEqual(sorted(responses), list(range(8)))
+        self.assertIn("<h1>Page 5</h1>", responses[5]["html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
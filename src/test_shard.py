@@ -0,0 +1,126 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from buildplan import make_plan
+from output import WriteStats
+from shard import (
+    merge_shards,
+    parse_shard,
+    select_shard,
+    shard_of,
+    write_shard_marker,
+)
+
+
+class TestShard(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        path = os.path.join(self.tmp.name, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ("0/4", "5/4", "1/0", "a/4", "1"):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_shard_of_is_stable(self):
+        self.assertEqual(shard_of("blog/tom/index.md", 1), 1)
+        self.assertEqual(
+            shard_of(os.path.join("blog", "tom", "index.md"), 7),
+            shard_of("blog/tom/index.md", 7),
+        )
+
+    def test_shards_are_disjoint_and_complete(self):
+        content = os.path.join(self.tmp.name, "content")
+        static = os.path.join(self.tmp.name, "static")
+        for i in range(40):
+            self.write(f"content/page{i}/index.md", f"# Page {i}")
+        self.write("static/index.css", "body {}")
+        plan = make_plan(content, static, "public")
+        shards = [select_shard(plan, content, i, 3) for i in (1, 2, 3)]
+        sources = [entry.source for shard in shards for entry in shard.pages]
+        self.assertEqual(sorted(sources), sorted(e.source for e in plan.pages))
+        self.assertEqual([len(shard.assets) for shard in shards], [1, 0, 0])
+
+    def shards(self, *names):
+        shard_dir_paths = [os.path.join(self.tmp.name, name) for name in names]
+        for index, shard_dir_path in enumerate(shard_dir_paths, 1):
+            write_shard_marker(shard_dir_path, index, len(names))
+        return shard_dir_paths
+
+    def merge(self, shards, public):
+        stats = WriteStats()
+        with redirect_stdout(io.StringIO()):
+            removed = merge_shards(shards, public, stats=stats)
+        return removed, stats
+
+    def test_merge(self):
+        self.write("a/index.html", "a")
+        self.write("b/blog/index.html", "b")
+        self.write("public/stale.html", "old")
+        shards = self.shards("a", "b")
+        public = os.path.join(self.tmp.name, "public")
+        removed, _ = self.merge(shards, public)
+        self.assertEqual(removed, [os.path.join(public, "stale.html")])
+        with open(os.path.join(public, "blog", "index.html")) as f:
+            self.assertEqual(f.read(), "b")
+        self.assertEqual(sorted(os.listdir(public)), ["blog", "index.html"])
+
+    def test_merge_skips_unchanged_bytes(self):
+        self.write("a/index.html", "a")
+        self.write("b/blog/index.html", "b")
+        shards = self.shards("a", "b")
+        public = os.path.join(self.tmp.name, "public")
+        self.merge(shards, public)
+        # a fresh shard build rewrites the same bytes with a new mtime
+        self.write("a/index.html", "a")
+        os.utime(os.path.join(shards[0], "index.html"), ns=(0, 0))
+        self.write("b/blog/index.html", "changed")
+        _, stats = self.merge(shards, public)
+        self.assertEqual((stats.written, stats.skipped), (1, 1))
+
+    def test_merge_refuses_incomplete_or_mixed_shards(self):
+        self.write("a/index.html", "a")
+        self.write("b/blog/index.html", "b")
+        self.write("c/about/index.html", "c")
+        self.write("public/blog/index.html", "b")
+        a, b, c = (os.path.join(self.tmp.name, name) for name in ("a", "b", "c"))
+        public = os.path.join(self.tmp.name, "public")
+        for markers, shards, message in (
+            ([], [a], "not a finished shard build"),
+            ([(a, 1, 3), (b, 2, 3)], [a, b], "missing shards 3/3"),
+            ([(a, 1, 2), (b, 2, 3)], [a, b], "different shardings of 2, 3"),
+            ([(a, 1, 2), (b, 1, 2)], [a, b], "are both shard 1"),
+            ([(a, 1, 3), (b, 2, 3), (c, 3, 3)], [a, b], "missing shards 3/3"),
+        ):
+            for dir_path, index, count in markers:
+                write_shard_marker(dir_path, index, count)
+            with self.assertRaises(ValueError) as cm:
+                self.merge(shards, public)
+            self.assertIn(message, str(cm.exception))
+            self.assertEqual(os.listdir(public), ["blog"])
+
+    def test_merge_collision(self):
+        self.write("a/index.html", "a")
+        self.write("b/index.html", "b")
+        shards = self.shards("a", "b")
+        public = os.path.join(self.tmp.name, "public")
+        with self.assertRaises(ValueError) as cm:
+            merge_shards(shards, public)
+        self.assertIn("index.html", str(cm.exception))
+        self.assertFalse(os.path.exists(public))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(
+            template.render("Home", "<p>hi</p>"),
+            "<title>Home</title><main><p>hi</p></main>",
+        )
+
+    def test_repeated_placeholder(self):
+        template = Template("{{ Title }}|{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render("a", "b"), "a|a|b")
+
+    def test_no_placeholders(self):
+        template = Template("<p>static</p>")
+        self.assertEqual(template.render("a", "b"), "<p>static</p>")
+
+    def test_basepath_rewrites_template(self):
+        template = Template('<link href="/index.css" />{{ Content }}', "/site/")
+        self.assertEqual(template.segments[0], '<link href="/site/index.css" />')
+        self.assertEqual(template.render("t", ""), '<link href="/site/index.css" />')
+
+    def test_references_before_basepath_rewrite(self):
+        template = Template(
+            '<link href="/index.css" />{{ Content }}<a href="/blog">b</a>', "/site/"
+        )
+        self.assertEqual(template.references, ["/index.css", "/blog"])
+
+    def test_basepath_rewrites_content(self):
+        template = Template("<main>{{ Content }}</main>", "/site/")
+        self.assertEqual(
+            template.render("t", '<a href="/blog">b</a><img src="/a.png"></img>'),
+            '<main><a href="/site/blog">b</a><img src="/site/a.png"></img></main>',
+        )
+
+    def test_placeholder_text_in_content_is_not_expanded(self):
+        template = Template("{{ Content }}<title>{{ Title }}</title>")
+        self.assertEqual(
+            template.render("t", "{{ Title }}"), "{{ Title }}<title>t</title>"
+        )
+
+    def test_stream_matches_render(self):
+        template = Template('<title>{{ Title }}</title><a href="/">{{ Content }}</a>', "/b/")
+        parts = []
+        template.stream(
+            parts.append,
+            "t",
+            lambda write: [write('<img src="/x.png">'), write("<p>y</p>")],
+        )
+        self.assertEqual(
+            "".join(parts), template.render("t", '<img src="/x.png"><p>y</p>')
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from watch import Watcher, diff_snapshots
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def test_no_changes(self):
+        state = {"a.md": (1, 10, "a.html")}
+        self.assertEqual(diff_snapshots(state, dict(state)), ([], []))
+
+    def test_changed_added_removed(self):
+        old = {"a.md": (1, 10, "a.html"), "b.md": (1, 10, "b.html")}
+        new = {"a.md": (2, 10, "a.html"), "c.md": (1, 5, "c.html")}
+        self.assertEqual(diff_snapshots(old, new), (["a.md", "c.md"], ["b.md"]))
+
+    def test_size_change(self):
+        old = {"a.md": (1, 10, "a.html")}
+        new = {"a.md": (1, 11, "a.html")}
+        self.assertEqual(diff_snapshots(old, new), (["a.md"], []))
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.mtime = 1_000_000_000_000_000_000
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.watcher = Watcher(
+            "/", self.content, self.static, self.public, self.template
+        )
+        # everything added after the watcher starts is built by the next poll
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post.md", "# Post")
+        self.write("static/index.css", "body {}")
+        self.poll()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        # an explicit, increasing mtime so every edit is seen by the snapshot
+        path = os.path.join(self.tmp.name, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        self.mtime += 1_000_000_000
+        os.utime(path, ns=(self.mtime, self.mtime))
+
+    def read(self, path):
+        with open(os.path.join(self.public, path)) as f:
+            return f.read()
+
+    def poll(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.watcher.poll()
+        return output.getvalue()
+
+    def test_poll_without_changes_does_nothing(self):
+        self.assertEqual(self.poll(), "")
+
+    def test_edit_renders_only_that_page(self):
+        self.write("content/blog/post.md", "# Edited")
+        output = self.poll()
+        self.assertIn("post.md", output)
+        self.assertNotIn("index.md", output)
+        self.assertEqual(
+            self.read("blog/post.html"),
+            "<title>Edited</title><div><h1>Edited</h1></div>",
+        )
+
+    def test_added_and_deleted_page(self):
+        self.write("content/about/index.md", "# About")
+        self.poll()
+        self.assertEqual(
+            self.read("about/index.html"),
+            "<title>About</title><div><h1>About</h1></div>",
+        )
+        os.remove(os.path.join(self.content, "about", "index.md"))
+        self.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "about")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_asset_changes(self):
+        self.write("static/index.css", "body { color: red }")
+        self.write("static/images/logo.png", "png")
+        self.poll()
+        self.assertEqual(self.read("index.css"), "body { color: red }")
+        self.assertEqual(self.read("images/logo.png"), "png")
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+        self.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images")))
+
+    def test_template_change_renders_every_page(self):
+        self.write("template.html", "<h2>{{ Title }}</h2>{{ Content }}")
+        output = self.poll()
+        self.assertIn("rendering every page", output)
+        self.assertEqual(
+            self.read("index.html"), "<h2>Home</h2><div><h1>Home</h1></div>"
+        )
+        self.assertEqual(
+            self.read("blog/post.html"), "<h2>Post</h2><div><h1>Post</h1></div>"
+        )
+
+    def test_invalid_page_is_reported_and_skipped(self):
+        self.write("content/blog/post.md", "no title")
+        self.assertIn(" ! ", self.poll())
+        self.assertEqual(
+            self.read("blog/post.html"), "<title>Post</title><div><h1>Post</h1></div>"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
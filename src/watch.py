@@ -0,0 +1,156 @@
+import os
+import argparse
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from buildplan import make_plan
+from gencontent import render_page
+from main import (
+    build_full,
+    dir_path_content,
+    dir_path_public,
+    dir_path_static,
+    template_path,
+)
+from manifest import remove_output
+from output import WriteStats, copy_if_changed
+from template import load_template
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the site on changes and serve the output directory."
+    )
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.25,
+        help="seconds between polls of content/, static/ and the template",
+    )
+    return parser.parse_args()
+
+
+def snapshot(files):
+    state = {}
+    for from_path, dest_path in files:
+        try:
+            stat = os.stat(from_path)
+        except FileNotFoundError:
+            continue
+        state[from_path] = (stat.st_mtime_ns, stat.st_size, dest_path)
+    return state
+
+
+def plan_snapshot(entries):
+    # the scan already stat()ed every file, no second pass needed
+    return {
+        entry.source: (entry.mtime_ns, entry.size, entry.dest) for entry in entries
+    }
+
+
+def diff_snapshots(old, new):
+    changed = [path for path in new if old.get(path, (None,))[:2] != new[path][:2]]
+    removed = [path for path in old if path not in new]
+    return changed, removed
+
+
+class Watcher:
+    def __init__(
+        self,
+        basepath,
+        content=dir_path_content,
+        static=dir_path_static,
+        public=dir_path_public,
+        template=template_path,
+    ):
+        self.basepath = basepath
+        self.content = content
+        self.static = static
+        self.public = public
+        self.template_path = template
+        self.template = load_template(template, basepath)
+        self.template_state = snapshot([(template, None)])
+        plan = make_plan(content, static, public)
+        self.pages = plan_snapshot(plan.pages)
+        self.assets = plan_snapshot(plan.assets)
+
+    def poll(self):
+        template_state = snapshot([(self.template_path, None)])
+        plan = make_plan(self.content, self.static, self.public)
+        pages = plan_snapshot(plan.pages)
+        assets = plan_snapshot(plan.assets)
+
+        changed_pages, removed_pages = diff_snapshots(self.pages, pages)
+        changed_assets, removed_assets = diff_snapshots(self.assets, assets)
+        if template_state != self.template_state and template_state:
+            print(f" * {self.template_path} changed, rendering every page")
+            self.template = load_template(self.template_path, self.basepath)
+            changed_pages = list(pages)
+
+        for from_path in changed_pages:
+            dest_path = pages[from_path][2]
+            started = time.perf_counter()
+            try:
+                render_page(from_path, self.template, dest_path)
+            except (OSError, ValueError) as e:
+                print(f" ! {from_path}: {e}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f" * {from_path} -> {dest_path} ({elapsed:.1f} ms)")
+        for from_path in changed_assets:
+            dest_path = assets[from_path][2]
+            copy_if_changed(from_path, dest_path)
+            print(f" * {from_path} -> {dest_path}")
+        for from_path in removed_pages:
+            dest_path = self.pages[from_path][2]
+            remove_output(dest_path, self.public)
+            print(f" - {dest_path}")
+        for from_path in removed_assets:
+            dest_path = self.assets[from_path][2]
+            remove_output(dest_path, self.public)
+            print(f" - {dest_path}")
+
+        self.template_state = template_state
+        self.pages = pages
+        self.assets = assets
+
+
+def serve(port):
+    handler = partial(SimpleHTTPRequestHandler, directory=dir_path_public)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    args = parse_args()
+
+    print("Building site...")
+    stats = WriteStats()
+    build_full(args.basepath, 1, False, stats)
+    print(f"{stats.written} files written, {stats.skipped} unchanged")
+
+    watcher = Watcher(args.basepath)
+    server = serve(args.port)
+    print(f"Serving {dir_path_public} on http://localhost:{args.port}/")
+    print("Watching for changes, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(args.interval)
+            try:
+                watcher.poll()
+            except OSError as e:
+                print(f" ! {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()